@@ -0,0 +1,41 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+import shapely
+from shapely import Polygon, MultiPolygon, LineString, box
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def convex():
+    return MultiPolygon([ shapely.Point(0, 0).buffer(50, 64) ])
+
+def concave():
+    # a comb: twenty thin teeth on a spine
+    teeth = [ box(x, 0, x + 2, 60) for x in range(0, 100, 5) ]
+    return MultiPolygon([ shapely.union_all(teeth + [ box(0, 60, 100, 70) ]) ])
+
+def holed():
+    holes = [ box(x + 1, y + 1, x + 4, y + 4).exterior.coords for x in range(0, 100, 5) for y in range(0, 100, 5) ]
+    return MultiPolygon([ Polygon(box(0, 0, 100, 100).exterior.coords, holes) ])
+
+def thin_stroke():
+    t = np.linspace(0, 6 * np.pi, 400)
+    spiral = LineString(np.column_stack([ t * np.cos(t), t * np.sin(t) ]) * 3)
+    return MultiPolygon([ spiral.buffer(0.8) ])
+
+def islands():
+    return MultiPolygon([ shapely.Point(x, y).buffer(4, 16) for x in range(0, 100, 10) for y in range(0, 50, 10) ])
+
+POLYGONS = {
+    "convex": convex,
+    "concave": concave,
+    "holed": holed,
+    "thin_stroke": thin_stroke,
+    "islands": islands,
+}
+
+@pytest.fixture(params=sorted(POLYGONS))
+def polygon(request):
+    return POLYGONS[request.param]()
@@ -0,0 +1,74 @@
+"""
+startup budgets, measured in a fresh interpreter with python -X importtime
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# seconds
+REGISTER_BUDGET = 0.25
+CORE_BUDGET = 1.0
+
+HEAVY = [ "numpy", "shapely", "scipy", "sklearn", "triangulate" ]
+
+def run(code):
+    """
+    runs code in a fresh interpreter and returns the cumulative import
+    time of every top-level module it imported, in seconds, and what
+    the code printed
+    """
+    result = subprocess.run([ sys.executable, "-X", "importtime", "-c", code ], cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if not line.startswith("import time:") or len(fields) != 3: continue
+        try: cumulative = int(fields[1])
+        except ValueError: continue # header
+        name = fields[2]
+        # top-level modules are the ones importtime does not indent
+        if name.startswith(" ") and not name.startswith("  "): times[name.strip()] = cumulative / 1e6
+    return times, result.stdout
+
+# Blender's modules, stubbed so registering the add-on runs anywhere:
+# bpy.types hands out classes to subclass, everything else is a no-op
+STUBS = """
+import sys, types
+class Stub(types.ModuleType):
+    def __getattr__(self, name):
+        value = type(name, (), {}) if self.__name__ == "bpy.types" else Stub(self.__name__ + "." + name)
+        setattr(self, name, value)
+        return value
+    def __call__(self, *args, **kwargs): return None
+for name in ("bpy", "bmesh", "mathutils"): sys.modules[name] = Stub(name)
+"""
+
+def test_register_budget():
+    code = "\n".join([
+        STUBS,
+        "import time",
+        "start = time.perf_counter()",
+        "import svg_paste",
+        "svg_paste.register()",
+        "print(time.perf_counter() - start)",
+        "print(' '.join(sys.modules))",
+    ])
+    times, out = run(code)
+    elapsed, modules = out.splitlines()[-2:]
+    assert float(elapsed) < REGISTER_BUDGET
+    assert not set(HEAVY) & set(modules.split())
+
+def test_core_budget():
+    code = "\n".join([
+        "import sys, triangulate",
+        "from shapely import box",
+        "triangulate.area_weighted_sampling(box(0, 0, 1, 1), 10)",
+        "print(' '.join(sys.modules))",
+    ])
+    times, out = run(code)
+    assert times["triangulate"] < CORE_BUDGET
+    # scipy is only loaded by the methods that need it
+    assert "scipy" not in out.split()
@@ -0,0 +1,114 @@
+"""
+behaviour of the in-memory SVG reader and of its path to polygons
+"""
+import numpy as np
+import pytest
+
+from triangulate.svg import length, parse_path, parse_svg, parse_transform
+from triangulate.pipeline import loops_to_poly, svg_to_polys
+
+def svg(body, attributes=""):
+    return '<svg xmlns="http://www.w3.org/2000/svg" {}>{}</svg>'.format(attributes, body).encode()
+
+def ends(d):
+    # the end point of every segment of the first subpath
+    segments, closed = parse_path(d)[0]
+    return segments[:, 3].tolist(), closed
+
+def bulge(d):
+    # the farthest the flattened arc strays from the x axis, signed
+    y = np.concatenate([ s[:, :, 1].ravel() for s, _ in parse_path(d) ])
+    return y[np.argmax(np.abs(y))]
+
+def test_lines_absolute_and_relative():
+    assert ends("M0 0 H10 V10 h-10 z") == ([ [ 10, 0 ], [ 10, 10 ], [ 0, 10 ], [ 0, 0 ] ], True)
+    # pairs after a moveto are implicit linetos of the same kind
+    assert ends("m1 1 2 0 0 2") == ([ [ 3, 1 ], [ 3, 3 ] ], False)
+    assert ends("M1 1 2 1 2 2") == ([ [ 2, 1 ], [ 2, 2 ] ], False)
+
+def test_subpaths():
+    subpaths = parse_path("M0 0 L1 0 L1 1 Z m2 0 l1 0 l0 1")
+    assert [ closed for _, closed in subpaths ] == [ True, False ]
+    # a relative moveto after closepath starts from the subpath start
+    assert subpaths[1][0][0, 0].tolist() == [ 2, 0 ]
+
+def test_smooth_curves_reflect_the_previous_control():
+    segments, _ = parse_path("M0 0 C0 1 1 1 1 0 S2 -1 2 0")[0]
+    assert segments[1, 1].tolist() == [ 1, -1 ]
+    segments, _ = parse_path("M0 0 Q1 1 2 0 T4 0")[0]
+    # the quadratic control (3, -1), raised to a cubic
+    assert segments[1, 1] == pytest.approx([ 2 + 2 / 3, -2 / 3 ])
+
+def test_arc_flags():
+    small = bulge("M0 0 A10 10 0 0 1 10 0")
+    large = bulge("M0 0 A10 10 0 1 1 10 0")
+    assert abs(small) < 10 < abs(large)
+    # the sweep flag picks the side of the chord
+    assert np.sign(bulge("M0 0 A10 10 0 0 0 10 0")) == -np.sign(small)
+    assert parse_path("M0 0 A10 10 0 0 1 10 0")[0][0][-1, 3].tolist() == [ 10, 0 ]
+
+def test_compact_arc_flags():
+    compact = parse_path("M0 0 a10 10 0 1020 0")
+    spaced = parse_path("M0 0 a10 10 0 1 0 20 0")
+    assert len(compact) == len(spaced) == 1
+    assert np.allclose(compact[0][0], spaced[0][0])
+    assert compact[0][0][-1, 3].tolist() == [ 20, 0 ]
+
+def test_transforms():
+    def apply(text, p): return (parse_transform(text) @ (*p, 1))[:2].tolist()
+    assert apply("translate(10 20) scale(2)", (1, 1)) == [ 12, 22 ]
+    assert apply("rotate(90)", (1, 0)) == pytest.approx([ 0, 1 ])
+    assert apply("rotate(90, 1, 1)", (2, 1)) == pytest.approx([ 1, 2 ])
+    assert apply("matrix(1 0 0 1 5 6)", (0, 0)) == [ 5, 6 ]
+
+    shapes = parse_svg(svg('<g transform="translate(10,0)"><rect transform="scale(2)" width="1" height="1"/></g>'))
+    points = shapes[0].loops(0.1)[0]
+    assert points.min(axis=0).tolist() == [ 10, 0 ]
+    assert points.max(axis=0).tolist() == [ 12, 2 ]
+
+def test_units():
+    assert length("1in") == 90
+    assert length("2.54cm") == pytest.approx(90)
+    assert length("72pt") == 90
+    assert length("12") == length("12px") == 12
+
+def test_viewbox():
+    data = svg('<rect width="210" height="297"/>', 'width="210mm" height="297mm" viewBox="0 0 210 297"')
+    points = parse_svg(data)[0].loops(0.1)[0]
+    assert points.max(axis=0) == pytest.approx([ 210 * 90 / 25.4, 297 * 90 / 25.4 ])
+    # the viewBox origin moves to the document origin
+    data = svg('<rect x="5" y="5" width="10" height="10"/>', 'width="20" height="20" viewBox="5 5 10 10"')
+    points = parse_svg(data)[0].loops(0.1)[0]
+    assert points.min(axis=0).tolist() == [ 0, 0 ]
+    assert points.max(axis=0).tolist() == [ 20, 20 ]
+
+SAME_WAY = "M0 0H10V10H0Z M3 3H7V7H3Z"
+OPPOSITE = "M0 0H10V10H0Z M3 3V7H7V3Z"
+
+@pytest.mark.parametrize("d, rule, area", [
+    (SAME_WAY, "nonzero", 100),
+    (SAME_WAY, "evenodd", 84),
+    (OPPOSITE, "nonzero", 84),
+    (OPPOSITE, "evenodd", 84),
+])
+def test_fill_rules(d, rule, area):
+    ((_, poly),) = svg_to_polys(svg('<path fill-rule="{}" d="{}"/>'.format(rule, d)))
+    assert poly.is_valid
+    assert poly.area == pytest.approx(area)
+
+def test_evenodd_islands_in_holes():
+    # a square in the hole of a ring is filled again, with its own hole
+    d = "M0 0H10V10H0Z M2 2H8V8H2Z M4 4H6V6H4Z"
+    ((_, poly),) = svg_to_polys(svg('<path style="fill-rule:evenodd" d="{}"/>'.format(d)))
+    assert len(poly.geoms) == 2
+    assert poly.area == pytest.approx(100 - 36 + 4)
+
+def test_bow_tie_is_repaired():
+    poly = loops_to_poly([ np.array([ [ 0, 0 ], [ 10, 10 ], [ 10, 0 ], [ 0, 10 ] ], dtype=float) ])
+    assert poly.is_valid
+    assert len(poly.geoms) == 2
+    assert poly.area == pytest.approx(50)
+
+def test_zero_area_shapes_are_skipped():
+    body = '<path id="flat" d="M0 0 L5 5 L10 10 Z"/><line x1="0" y1="0" x2="5" y2="0"/><rect id="kept" width="1" height="1"/>'
+    assert [ shape.id for shape, _ in svg_to_polys(svg(body)) ] == [ "kept" ]
@@ -0,0 +1,103 @@
+"""
+benchmarks of the headless geometry core, run with
+
+    python -m pytest benchmarks --benchmark-only
+
+every case records peak traced memory and triangle quality next to
+the timings in the benchmark's extra_info
+"""
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+import shapely
+
+import triangulate
+
+SAMPLERS = [
+    "random_points_sampling",
+    "area_weighted_sampling",
+    "uniform_grid_sampling",
+    "hexagonal_grid_sampling",
+    "blue_noise_sampling",
+    "poisson_disc_sampling",
+    "centroid_sampling",
+]
+
+COUNTS = [ 1000, 10000, 100000 ]
+
+# Poisson disc only ships enabled as long as it keeps up with these
+GRID_SAMPLERS = [ "uniform_grid_sampling", "hexagonal_grid_sampling" ]
+
+def run(benchmark, fn):
+    result = benchmark.pedantic(fn, setup=triangulate.clear_caches, rounds=3, iterations=1)
+
+    # memory is traced on a separate, untimed run: tracemalloc slows
+    # down every allocation it sees
+    triangulate.clear_caches()
+    tracemalloc.start()
+    fn()
+    benchmark.extra_info["peak_memory"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result
+
+@pytest.mark.parametrize("count", COUNTS)
+@pytest.mark.parametrize("method", SAMPLERS)
+def test_sampling(benchmark, polygon, method, count):
+    points = run(benchmark, lambda: getattr(triangulate, method)(polygon, count))
+    benchmark.extra_info["points"] = len(points)
+    assert len(points)
+
+@pytest.mark.parametrize("count", COUNTS)
+@pytest.mark.parametrize("method", SAMPLERS)
+def test_triangulate_islands(benchmark, polygon, method, count):
+    tm = run(benchmark, lambda: triangulate.triangulate_islands(polygon, method, count))
+    quality = tm.triangle_quality()
+    benchmark.extra_info["triangles"] = len(tm)
+    benchmark.extra_info["mean_quality"] = float(quality.mean())
+    benchmark.extra_info["min_quality"] = float(quality.min())
+    assert len(tm)
+
+    # every face winds counter-clockwise, so Blender's normals face +z
+    a, b, c = np.moveaxis(tm.vertices[tm.indices.reshape(-1, 3), :2].astype(float), 1, 0)
+    assert ((b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0]) > 0).all()
+
+    # and the faces tile the polygon: none sticks out of it (past float32
+    # rounding) and their areas add up to its own, so the union is the
+    # polygon, holes and all
+    minx, miny, maxx, maxy = polygon.bounds
+    outline = polygon.buffer(1e-6 * max(maxx - minx, maxy - miny))
+    shapely.prepare(outline)
+    faces = shapely.polygons(tm.vertices[tm.indices.reshape(-1, 3), :2].astype(float))
+    assert shapely.covers(outline, faces).all()
+    assert shapely.area(faces).sum() == pytest.approx(polygon.area, rel=1e-5)
+
+@pytest.mark.parametrize("count", COUNTS)
+def test_boundary_loops(benchmark, polygon, count):
+    tm = triangulate.triangulate_islands(polygon, "area_weighted_sampling", count)
+    edges, faces = tm.edges()
+    loops = run(benchmark, lambda: triangulate.boundary_loops(edges[faces < 2], tm.vertices))
+    assert len(loops) >= len(polygon.geoms)
+
+@pytest.mark.parametrize("method", [ "poisson_disc_sampling" ] + GRID_SAMPLERS)
+def test_poisson_disc_against_grids(benchmark, request, polygon, method):
+    benchmark.group = "50k points, " + request.node.callspec.params["polygon"]
+    tm = run(benchmark, lambda: triangulate.triangulate_islands(polygon, method, 50000))
+    benchmark.extra_info["triangles"] = len(tm)
+
+def test_poisson_disc_competitive(polygon):
+    """
+    sampled and triangulated, 50k Poisson disc points cost at most
+    twice what the slower grid sampler does
+    """
+    def best(method):
+        times = []
+        for _ in range(3):
+            triangulate.clear_caches()
+            start = time.perf_counter()
+            triangulate.triangulate_islands(polygon, method, 50000)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    assert best("poisson_disc_sampling") < 2 * max(best(m) for m in GRID_SAMPLERS)
@@ -3,8 +3,10 @@ import subprocess
 import math
 import os
 import tempfile
+import hashlib
 import mathutils
-import bmesh
+import numpy as np
+from mathutils.bvhtree import BVHTree
 
 # ----------------------------------------
 # helper functions for SVG
@@ -77,31 +79,161 @@ def rotate_svg_onto_plane(svg_obj, view_plane):
 # helper functions for patch deform
 # ----------------------------------------
 
-def mesh_distance(self, obj):
+def vertex_coords(mesh):
+    co = np.empty(3 * len(mesh.vertices))
+    mesh.vertices.foreach_get("co", co)
+    return co.reshape(-1, 3)
+
+def world_coords(obj):
+    m = np.array(obj.matrix_world)
+    return vertex_coords(obj.data) @ m[:3, :3].T + m[:3, 3]
+
+def loop_vertices(mesh):
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int64)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    return loop_verts
+
+def triangle_loops(mesh):
     """
-    calculates the average distance between vertices of two
-    meshes
+    (T, 3) loop indices of the triangulated faces of mesh, so quads and
+    ngons are split properly rather than cut to their first three
+    corners. Two meshes with the same topology share their loops even if
+    their vertex order differs, so each maps these to its own vertices
+    through its own loop_vertices
     """
-    mesh_a = self
-    mesh_b = obj
+    mesh.calc_loop_triangles()
+    loops = np.empty(3 * len(mesh.loop_triangles), dtype=np.int64)
+    mesh.loop_triangles.foreach_get("loops", loops)
+    return loops.reshape(-1, 3)
 
-    total_distance = 0.0
-    vertex_count = 0
-    average_distance = 0
-    
-    if mesh_a and mesh_b:
-        for vertex_a in mesh_a.data.vertices:
-            vertex_a_co_world = mesh_a.matrix_world @ vertex_a.co
-            result, location, normal, index = mesh_b.closest_point_on_mesh(vertex_a_co_world)
+# ----------------------------------------
+# cached surfaces and correspondences: keyed on the mesh datablock,
+# dropped as soon as its geometry or transform no longer hashes the same
+# ----------------------------------------
+
+_surfaces = {}
+_maps = {}
+
+def geometry_hash(obj):
+    mesh = obj.data
+    loop_verts = loop_vertices(mesh)
+    h = hashlib.sha1(np.array(obj.matrix_world, dtype=np.float64).tobytes())
+    h.update(vertex_coords(mesh).tobytes())
+    h.update(loop_verts.tobytes())
+    return h.hexdigest()
 
-            distance = (location - vertex_a_co_world).length
-            total_distance += distance
-            vertex_count += 1
-        if vertex_count > 0:
-            average_distance = total_distance / vertex_count
-                
-        # Free the BMesh
-    return average_distance
+class Surface:
+    """
+    world space triangles of a mesh object with a BVH over them
+    """
+    def __init__(self, obj, key):
+        self.pointer = obj.data.as_pointer()
+        self.key = key
+        self.co = world_coords(obj)
+        self.loop_verts = loop_vertices(obj.data)
+        self.loops = triangle_loops(obj.data)
+        self.triangles = self.loop_verts[self.loops]
+        self.tree = BVHTree.FromPolygons(self.co.tolist(), self.triangles.tolist())
+
+    def nearest(self, points):
+        """
+        (indices, distances) of the triangles nearest to points, -1 and
+        inf where there is none
+        """
+        hits = [ self.tree.find_nearest(p) for p in points.tolist() ]
+        index = np.array([ -1 if h[2] is None else h[2] for h in hits ], dtype=np.int64)
+        dist = np.array([ np.inf if h[3] is None else h[3] for h in hits ])
+        return index, dist
+
+def get_surface(obj):
+    key = geometry_hash(obj)
+    surface = _surfaces.get(obj.data.as_pointer())
+    if surface is None or surface.key != key:
+        surface = _surfaces[obj.data.as_pointer()] = Surface(obj, key)
+    return surface
+
+def affine_maps(source, dest):
+    """
+    the per triangle affine maps (A (T, 3, 3), b (T, 3)) that take a
+    point near a source triangle to the same place on the matching dest
+    triangle: barycentric weights in the triangle plane, plus the offset
+    from the plane scaled by the change in size, as
+    mathutils.geometry.barycentric_transform does
+    """
+    def frame(co, triangles):
+        a = co[triangles[:, 0]]
+        e1 = co[triangles[:, 1]] - a
+        e2 = co[triangles[:, 2]] - a
+        n = np.cross(e1, e2)
+        area = np.linalg.norm(n, axis=1)
+        n /= np.where(area > 0, area, 1)[:, None]
+        return a, np.stack([ e1, e2, n ], axis=2), area
+
+    a_src, m_src, area_src = frame(source.co, source.triangles)
+    # the dest triangles are the source's loop triangles, through the
+    # dest mesh's own loop -> vertex mapping
+    a_dst, m_dst, area_dst = frame(dest.co, dest.loop_verts[source.loops])
+    ok = area_src > 0
+    m_dst[:, :, 2] *= np.sqrt(area_dst / np.where(ok, area_src, 1))[:, None]
+
+    # points over degenerate source triangles stay where they are
+    A = np.broadcast_to(np.eye(3), m_src.shape).copy()
+    A[ok] = m_dst[ok] @ np.linalg.inv(m_src[ok])
+    b = np.zeros_like(a_src)
+    b[ok] = a_dst[ok] - np.einsum("tij,tj->ti", A[ok], a_src[ok])
+    return A, b
+
+def get_affine_maps(source, dest):
+    # one destination per source mesh is kept
+    key = (source.key, dest.key)
+    cached = _maps.get(source.pointer)
+    if cached is None or cached[0] != key:
+        cached = _maps[source.pointer] = (key, affine_maps(source, dest))
+    return cached[1]
+
+def clear_caches():
+    _surfaces.clear()
+    _maps.clear()
+
+def mesh_distance(self, obj, samples=None, seed=0):
+    """
+    calculates the average distance between vertices of two
+    meshes, estimated from a random subset of samples vertices
+    if given
+    """
+    if not (self and obj) or not len(self.data.vertices): return 0
+    co = world_coords(self)
+    if samples is not None and samples < len(co):
+        co = co[np.random.default_rng(seed).choice(len(co), samples, replace=False)]
+    _, dist = get_surface(obj).nearest(co)
+    return float(np.mean(dist[np.isfinite(dist)])) if np.isfinite(dist).any() else 0
+
+def closer_mesh(self, obj_b, obj_c, batch=64, z=3.0, seed=0):
+    """
+    whichever of obj_b and obj_c is on average closer to the vertices
+    of self (obj_b on a tie). Vertices are drawn in random batches and
+    the per vertex difference of the two distances is accumulated until
+    its mean is z standard errors away from zero, so clearly separated
+    meshes are told apart after a batch or two while close calls fall
+    back to every vertex, and the exact answer
+    """
+    co = world_coords(self)
+    if not len(co): return obj_b
+    surface_b, surface_c = get_surface(obj_b), get_surface(obj_c)
+    order = np.random.default_rng(seed).permutation(len(co))
+
+    n, total, total_sq = 0, 0.0, 0.0
+    for start in range(0, len(co), batch):
+        points = co[order[start:start + batch]]
+        _, dist_b = surface_b.nearest(points)
+        _, dist_c = surface_c.nearest(points)
+        diff = dist_b - dist_c
+        n, total, total_sq = n + len(diff), total + diff.sum(), total_sq + (diff * diff).sum()
+        if n >= 2 * batch and n < len(co):
+            mean = total / n
+            se = np.sqrt(max(total_sq / n - mean * mean, 0) / (n - 1))
+            if abs(mean) > z * se: break
+    return obj_c if total > 0 else obj_b
 
 
 # -------------------------------------------------------
@@ -111,67 +243,217 @@ def mesh_distance(self, obj):
 # in which you select them
 # -------------------------------------------------------
 def patch_deform(ob_a, source_mesh, dest_mesh):
-    dist_ab = mesh_distance(ob_a, source_mesh)
-    dist_ac = mesh_distance(ob_a, dest_mesh)
-    if dist_ab > dist_ac: source_mesh, dest_mesh = [ dest_mesh, source_mesh ]
-
-    ob_a.select_set(True)
-    bpy.ops.object.transform_apply()
-    ob_a.select_set(False)
-
-    source_mesh.select_set(True)
-    bpy.ops.object.transform_apply()
-    source_mesh.select_set(False)
-
-    dest_mesh.select_set(True)
-    bpy.ops.object.transform_apply()
-    dest_mesh.select_set(False)
-
-    bm_a = bmesh.new()
-    bm_a.from_mesh(ob_a.data)
-    bm_a.verts.ensure_lookup_table()
-    print(len(bm_a.verts))
-    print(len(ob_a.data.vertices))
-
-    for i, v in enumerate(bm_a.verts):
-        # Get the vertex's global coordinates
-        # v_co = bm_a.verts[v.index].co
-        m_co = bm_a.verts[i].co
-        result, location, normal, index = source_mesh.closest_point_on_mesh(m_co)
-
-        if result:
-            vt_b = [ source_mesh.data.vertices[v].co for v in source_mesh.data.polygons[index].vertices ]
-            vt_c = [ dest_mesh.data.vertices[v].co   for v in dest_mesh.data.polygons[index].vertices ]
-            co = mathutils.geometry.barycentric_transform(v.co, vt_b[0], vt_b[1], vt_b[2], vt_c[0], vt_c[1], vt_c[2])
-            bm_a.verts[i].co = co
-    bm_a.to_mesh(ob_a.data)
-    bm_a.free()
-            
+    if len(source_mesh.data.loops) != len(dest_mesh.data.loops):
+        raise ValueError("{} and {} do not share their topology".format(source_mesh.name, dest_mesh.name))
+
+    # the deform works in world space, so no transform is applied to any
+    # of the objects and the cached surfaces stay valid between decals
+    if closer_mesh(ob_a, source_mesh, dest_mesh) == dest_mesh: source_mesh, dest_mesh = [ dest_mesh, source_mesh ]
+
+    source = get_surface(source_mesh)
+    A, b = get_affine_maps(source, get_surface(dest_mesh))
+
+    co = world_coords(ob_a)
+    index, _ = source.nearest(co)
+    found = index >= 0
+    co[found] = np.einsum("nij,nj->ni", A[index[found]], co[found]) + b[index[found]]
+
+    m = np.linalg.inv(np.array(ob_a.matrix_world))
+    ob_a.data.vertices.foreach_set("co", (co @ m[:3, :3].T + m[:3, 3]).ravel())
+    ob_a.data.update()
+
 # ----------------------------------------
 # nudge on normals helper functions
 # ----------------------------------------
 
 def nudge_obj_on_normals(ob_a, amt):
-    bm_a = bmesh.new()
-    bm_a.from_mesh(ob_a.data)
-    bm_a.verts.ensure_lookup_table()
-    for vertex in bm_a.verts:
-        vertex.co += 0.006 * vertex.normal
-    bm_a.to_mesh(ob_a.data)
-    bm_a.free()
+    """
+    moves every vertex of ob_a by amt along its normal
+    """
+    mesh = ob_a.data
+    co = vertex_coords(mesh)
+    normals = np.empty(3 * len(mesh.vertices))
+    mesh.vertices.foreach_get("normal", normals)
+    co += amt * normals.reshape(-1, 3)
+    mesh.vertices.foreach_set("co", co.ravel())
+    mesh.update()
 
 
 # ----------------------------------------
 # easy knife helper functions
 # ----------------------------------------
 
-def easy_knife_cut_obj(target_obj, cutter_obj):
+def face_loops(mesh):
+    """
+    (loop_start, loop_total, loop vertex_index) arrays of mesh
+    """
+    starts = np.empty(len(mesh.polygons), dtype=np.int64)
+    totals = np.empty(len(mesh.polygons), dtype=np.int64)
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int64)
+    mesh.polygons.foreach_get("loop_start", starts)
+    mesh.polygons.foreach_get("loop_total", totals)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    return starts, totals, loop_verts
+
+def screen_coords(obj, co, region_3d):
+    """
+    normalized screen xy of the local points co of obj, and which of
+    them are behind the viewer
+    """
+    m = np.array(region_3d.perspective_matrix) @ np.array(obj.matrix_world)
+    h = co @ m[:, :3].T + m[:, 3]
+    behind = h[:, 3] <= 1e-9
+    return h[:, :2] / np.where(behind, 1, h[:, 3])[:, None], behind
+
+def footprint_faces(target_obj, cutter_obj, region_3d, margin=0.1):
+    """
+    boolean mask of the faces of target_obj whose screen bounds overlap
+    the projected bounding box of cutter_obj, grown by margin times its
+    size. Faces partly behind the viewer are kept
+    """
+    corners, _ = screen_coords(cutter_obj, np.array(cutter_obj.bound_box), region_3d)
+    lo, hi = corners.min(axis=0), corners.max(axis=0)
+    grow = margin * (hi - lo)
+    lo, hi = lo - grow, hi + grow
+
+    mesh = target_obj.data
+    starts, totals, loop_verts = face_loops(mesh)
+    if not len(starts): return np.zeros(0, dtype=bool)
+    xy, behind = screen_coords(target_obj, vertex_coords(mesh), region_3d)
+    xy, behind = xy[loop_verts], behind[loop_verts]
+
+    # loops of a face are contiguous, starting at its loop_start
+    order = np.argsort(starts)
+    face_lo = np.empty((len(starts), 2))
+    face_hi = np.empty((len(starts), 2))
+    face_behind = np.empty(len(starts), dtype=bool)
+    face_lo[order] = np.minimum.reduceat(xy, starts[order])
+    face_hi[order] = np.maximum.reduceat(xy, starts[order])
+    face_behind[order] = np.logical_or.reduceat(behind, starts[order])
+    return face_behind | ((face_lo <= hi) & (face_hi >= lo)).all(axis=1)
+
+# attribute data type -> (foreach property, components, dtype)
+ATTRIBUTE_ARRAYS = {
+    "FLOAT": ("value", 1, np.float32),
+    "INT": ("value", 1, np.int32),
+    "INT8": ("value", 1, np.int8),
+    "BOOLEAN": ("value", 1, bool),
+    "FLOAT2": ("vector", 2, np.float32),
+    "INT32_2D": ("value", 2, np.int32),
+    "FLOAT_VECTOR": ("vector", 3, np.float32),
+    "QUATERNION": ("value", 4, np.float32),
+    "FLOAT_COLOR": ("color", 4, np.float32),
+    "BYTE_COLOR": ("color", 4, np.float32),
+}
+
+def edge_keys(mesh, verts=None):
+    """
+    one int64 key per edge of mesh from its two vertex indices, mapped
+    through verts (old -> new index, -1 for dropped) if given
+    """
+    ends = np.empty(2 * len(mesh.edges), dtype=np.int64)
+    mesh.edges.foreach_get("vertices", ends)
+    ends = np.sort(ends.reshape(-1, 2), axis=1)
+    if verts is not None: ends = verts[ends]
+    return ends[:, 0] * (1 << 32) + ends[:, 1]
+
+def submesh(obj, face_mask, name):
+    """
+    a copy of obj holding only the faces in face_mask, with their
+    materials, UV maps, edge flags, custom normals, vertex groups and
+    the other generic attributes
+    """
+    mesh = obj.data
+    starts, totals, loop_verts = face_loops(mesh)
+    # faces in loop order, so the loops they keep are the kept faces' runs
+    order = np.argsort(starts)
+    faces = order[face_mask[order]]
+    loops = np.flatnonzero(np.repeat(face_mask[order], totals[order]))
+    verts, inverse = np.unique(loop_verts[loops], return_inverse=True)
+
+    new = bpy.data.meshes.new(name)
+    new.vertices.add(len(verts))
+    new.vertices.foreach_set("co", vertex_coords(mesh)[verts].ravel())
+    new.loops.add(len(loops))
+    new.loops.foreach_set("vertex_index", inverse.astype(np.int32))
+    new_totals = totals[faces].astype(np.int32)
+    new.polygons.add(len(new_totals))
+    new.polygons.foreach_set("loop_start", (np.cumsum(new_totals) - new_totals).astype(np.int32))
+    # loop_total is derived from loop_start since Blender 4.0
+    if bpy.app.version < (4, 0, 0): new.polygons.foreach_set("loop_total", new_totals)
+    new.update(calc_edges=True)
+
+    # edges are rebuilt from the faces, matched back by their vertices
+    new_index = np.full(len(mesh.vertices), -1, dtype=np.int64)
+    new_index[verts] = np.arange(len(verts))
+    old_keys = edge_keys(mesh, new_index)
+    by_key = np.argsort(old_keys)
+    found = np.searchsorted(old_keys[by_key], edge_keys(new))
+    edges = by_key[np.minimum(found, len(by_key) - 1)]
+
+    for domain, index in (("polygons", faces), ("edges", edges)):
+        for prop in { "polygons": ("material_index", "use_smooth"), "edges": ("use_seam", "use_edge_sharp") }[domain]:
+            values = np.empty(len(getattr(mesh, domain)), dtype=np.int32 if prop == "material_index" else bool)
+            getattr(mesh, domain).foreach_get(prop, values)
+            getattr(new, domain).foreach_set(prop, values[index])
+    for material in mesh.materials: new.materials.append(material)
+
+    for layer in mesh.uv_layers:
+        uv = np.empty(2 * len(mesh.loops))
+        layer.data.foreach_get("uv", uv)
+        new.uv_layers.new(name=layer.name).data.foreach_set("uv", uv.reshape(-1, 2)[loops].ravel())
+
+    # everything else stored as an attribute (creases, colors, ...);
+    # internal ones start with a dot and the ones set above exist already
+    domains = { "POINT": verts, "EDGE": edges, "FACE": faces, "CORNER": loops }
+    for attr in mesh.attributes:
+        if attr.name.startswith(".") or attr.name in new.attributes: continue
+        if attr.domain not in domains or attr.data_type not in ATTRIBUTE_ARRAYS: continue
+        prop, components, dtype = ATTRIBUTE_ARRAYS[attr.data_type]
+        values = np.empty(len(attr.data) * components, dtype=dtype)
+        attr.data.foreach_get(prop, values)
+        copy = new.attributes.new(attr.name, attr.data_type, attr.domain)
+        copy.data.foreach_set(prop, values.reshape(len(attr.data), -1)[domains[attr.domain]].ravel())
+
+    if mesh.has_custom_normals and "custom_normal" not in new.attributes:
+        normals = np.empty(3 * len(mesh.loops), dtype=np.float32)
+        if bpy.app.version < (4, 1, 0):
+            mesh.calc_normals_split()
+            mesh.loops.foreach_get("normal", normals)
+            new.use_auto_smooth = True
+        else:
+            mesh.corner_normals.foreach_get("vector", normals)
+        new.normals_split_custom_set(normals.reshape(-1, 3)[loops].tolist())
+
+    # a copy of the object keeps its vertex group names, modifiers and
+    # such; the weights live in the mesh and are copied vertex by vertex
+    patch = obj.copy()
+    patch.data = new
+    patch.name = name
+    groups = patch.vertex_groups
+    for i, v in enumerate(verts.tolist()):
+        for g in mesh.vertices[v].groups: groups[g.group].add([ i ], g.weight, 'REPLACE')
+    return patch
+
+def easy_knife_cut_obj(target_obj, cutter_obj, region_only=False, margin=0.1):
+    """
+    knife projects cutter_obj onto a copy of target_obj and separates
+    the cut piece, which is returned. With region_only, only the faces
+    under the cutter's footprint (grown by margin times its size) are
+    copied and cut, so the cost follows the size of the cut rather than
+    that of the target
+    """
     area = [area for area in bpy.context.screen.areas if area.type == "VIEW_3D"][0]
     region = [region for region in area.regions if region.type == 'WINDOW'][0]
 
     with bpy.context.temp_override(area=area, region=region):
-        duplicate_obj = target_obj.copy()
-        duplicate_obj.data = duplicate_obj.data.copy()
+        if region_only:
+            face_mask = footprint_faces(target_obj, cutter_obj, area.spaces.active.region_3d, margin)
+            if not face_mask.any(): return None
+            duplicate_obj = submesh(target_obj, face_mask, target_obj.name + " patch")
+        else:
+            duplicate_obj = target_obj.copy()
+            duplicate_obj.data = duplicate_obj.data.copy()
 
         bpy.context.collection.objects.link(duplicate_obj)
         # Apply any transformations to the duplicate object
@@ -183,10 +465,16 @@ def easy_knife_cut_obj(target_obj, cutter_obj):
         bpy.ops.object.mode_set(mode='EDIT')
         cutter_obj.select_set(True)
 
+        start_objects = [ o.name for o in bpy.data.objects ]
         bpy.ops.mesh.knife_project(cut_through=False)
         bpy.ops.mesh.separate(type='SELECTED')
+        bpy.ops.object.mode_set(mode='OBJECT')
+        cut = [ o for o in bpy.data.objects if o.name not in start_objects ]
 
+        mesh = duplicate_obj.data
         bpy.data.objects.remove(duplicate_obj, do_unlink=True)
+        if not mesh.users: bpy.data.meshes.remove(mesh)
+        return cut[0] if cut else None
 
         
 # ----------------------------------------
@@ -204,6 +492,24 @@ class MyProperties(bpy.types.PropertyGroup):
         type=bpy.types.Object,
         description="Select the wrapped object"
     )
+    knife_region_only: bpy.props.BoolProperty(
+        name="Cut Region Only",
+        description="Knife only the faces under the cutter instead of a copy of the whole wrapped object",
+        default=True
+    )
+    knife_margin: bpy.props.FloatProperty(
+        name="Region Margin",
+        description="How far beyond the cutter's footprint faces are included, relative to its size",
+        default=0.1,
+        min=0.0
+    )
+    nudge_amount: bpy.props.FloatProperty(
+        name="Nudge Amount",
+        description="Distance to move vertices along their normals",
+        default=0.006,
+        subtype='DISTANCE',
+        precision=4
+    )
 
 class OBJECT_OT_paste_svg(bpy.types.Operator):
     bl_idname = "object.paste_svg"
@@ -259,11 +565,8 @@ class OBJECT_OT_easy_knife_cut(bpy.types.Operator):
         wrapped_obj = my_tool.wrapped
         cutting_obj = bpy.context.active_object
 
-        easy_knife_cut_obj(wrapped_obj, cutting_obj)
-
-        # Stub function for easy knife cutting
-        print("Easy Knife Cut function called")
-        # Add your code here
+        cut = easy_knife_cut_obj(wrapped_obj, cutting_obj, my_tool.knife_region_only, my_tool.knife_margin)
+        if cut is None: self.report({'WARNING'}, "The cutter does not cover the wrapped object")
 
 class OBJECT_OT_nudge_on_normal(bpy.types.Operator):
     bl_idname = "object.nudge_on_normal"
@@ -274,11 +577,15 @@ class OBJECT_OT_nudge_on_normal(bpy.types.Operator):
         return {'FINISHED'}
     
     def nudge_on_normal(self, context):
-        # Stub function for nudging on an normal
-        print("Nudge on Normal function called")
-        nudge_obj_on_normals(bpy.context.active_object, 0.0006)
+        # every selected mesh, or the active one if nothing is selected
+        objects = [ o for o in context.selected_objects if o.type == 'MESH' ]
+        if not objects and context.active_object: objects = [ context.active_object ]
 
-        # Add your code here
+        # edit-mode meshes would overwrite the new coordinates on exit
+        saved_mode = context.mode
+        if saved_mode != 'OBJECT': bpy.ops.object.mode_set(mode='OBJECT')
+        for o in objects: nudge_obj_on_normals(o, context.scene.my_tool.nudge_amount)
+        if saved_mode == 'EDIT_MESH': bpy.ops.object.mode_set(mode='EDIT')
 
 class OBJECT_PT_cobbler_panel(bpy.types.Panel):
     bl_label = "Cobbler"
@@ -297,7 +604,10 @@ class OBJECT_PT_cobbler_panel(bpy.types.Panel):
         
         layout.operator("object.paste_svg")
         layout.operator("object.wrap_or_flatten")
+        layout.prop(my_tool, "knife_region_only")
+        if my_tool.knife_region_only: layout.prop(my_tool, "knife_margin")
         layout.operator("object.easy_knife_cut")
+        layout.prop(my_tool, "nudge_amount")
         layout.operator("object.nudge_on_normal")
 
 def register():
@@ -310,6 +620,7 @@ def register():
     bpy.utils.register_class(OBJECT_PT_cobbler_panel)
 
 def unregister():
+    clear_caches()
     bpy.utils.unregister_class(MyProperties)
     del bpy.types.Scene.my_tool
     bpy.utils.unregister_class(OBJECT_OT_paste_svg)
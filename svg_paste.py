@@ -6,17 +6,16 @@ import os
 import tempfile
 import mathutils
 import bmesh
-import shapely
 import re
 import time
-import numpy as np
 from mathutils import Vector
 
 
 if os.path.dirname(os.path.abspath(__file__)) not in sys.path:
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-import triangulate
+# triangulate (and with it numpy, shapely and scipy) is imported on
+# first use, so enabling the add-on stays cheap
 
 def get_current_view_plane(space):
     quat = space.region_3d.view_rotation
@@ -57,7 +56,10 @@ def get_svg_from_clipboard():
     
 def import_svg_from_clipboard(view_plane):
     try:
-        svg_content = get_svg_from_clipboard()
+        from triangulate.instrument import span
+        with span("clipboard read") as s:
+            svg_content = get_svg_from_clipboard()
+            s["bytes"] = len(svg_content)
 
         # Create a temporary file to save the SVG content
         temp_svg_filepath = None
@@ -68,7 +70,8 @@ def import_svg_from_clipboard(view_plane):
 
         # Import the SVG file into Blender
         start_objects = [ o.name for o in bpy.data.objects ]
-        bpy.ops.import_curve.svg(filepath=temp_svg_filepath)
+        with span("svg import"):
+            bpy.ops.import_curve.svg(filepath=temp_svg_filepath)
         svg_obj_names = [ o.name for o in bpy.data.objects if o.name not in start_objects ]
 
         if os.path.exists(temp_svg_filepath):
@@ -80,6 +83,31 @@ def import_svg_from_clipboard(view_plane):
     except Exception as e:
         print(f"An error occurred: {e}")
 
+def paste_svg_in_memory(as_mesh=False, tolerance=0.0001):
+    """
+    builds the clipboard SVG straight into curve datablocks, or flattens
+    it into filled meshes, without a temporary file or the import
+    operator, and returns the new objects
+    """
+    import triangulate
+    with triangulate.instrument.span("clipboard read") as s:
+        svg_content = get_svg_from_clipboard()
+        s["bytes"] = len(svg_content)
+
+    if as_mesh: return triangulate.svg_to_mesh_objects(svg_content, tolerance, name="Pasted Object")
+    return triangulate.svg_to_curve_objects(svg_content, name="Pasted Object")
+
+def begin_run(context, name):
+    """
+    starts recording pipeline spans with the panel's settings
+    """
+    import triangulate
+    svg_paste = context.scene.svg_paste
+    log_path = None
+    if svg_paste.log_timings and svg_paste.timing_log_path: log_path = bpy.path.abspath(svg_paste.timing_log_path)
+    triangulate.instrument.begin(name, svg_paste.trace_memory, log_path)
+    return triangulate.instrument
+
 def rotate_svg_onto_plane(svg_obj, view_plane):
     # Adjust orientation based on the view plane
     if view_plane == "xy":
@@ -109,11 +137,34 @@ def get_edge_lengths(edges):
 
         
 class SVGPasteSettings(bpy.types.PropertyGroup):
+    native_import: bpy.props.BoolProperty(
+        name="Native SVG Import",
+        description="Parse the clipboard SVG in memory instead of going through a file and the SVG import operator",
+        default=True
+    )
+    import_as_mesh: bpy.props.BoolProperty(
+        name="Import as Mesh",
+        description="Flatten the SVG curves straight into meshes, without creating curve objects",
+        default=False
+    )
+    curve_tolerance: bpy.props.FloatProperty(
+        name="Curve tolerance",
+        description="Maximum distance between a curve and its flattened outline",
+        default=0.0001,
+        min=0.000001,
+        precision=5,
+        unit='LENGTH'
+    )
     convert_to_mesh_after_pasting: bpy.props.BoolProperty(
         name="Convert to Mesh After Pasting",
         description="Convert to curve after pasting SVG",
         default=True
     )
+    join_after_converting: bpy.props.BoolProperty(
+        name="Join After Converting",
+        description="Join the converted meshes into a single object",
+        default=False
+    )
     triangulate_after_pasting: bpy.props.BoolProperty(
         name="Triangulate After Pasting",
         description="Triangulate after pasting SVG",
@@ -124,19 +175,37 @@ class SVGPasteSettings(bpy.types.PropertyGroup):
         description="Method for triangulation",
         items=[
             ('RANDOM_POINTS_SAMPLING', "Random triangles", ""),
+            ('AREA_WEIGHTED_SAMPLING', "Area-weighted random", ""),
             ('UNIFORM_GRID_SAMPLING', "Grid", ""),
             ('HEXAGONAL_GRID_SAMPLING', "Hexagons", ""),
-            # ('POISSON_DISC_SAMPLING', "Poisson discs", ""), # slow af
+            ('POISSON_DISC_SAMPLING', "Poisson discs", ""),
             ('BLUE_NOISE_SAMPLING', "Blue noise", ""),
             ('CENTROID_SAMPLING', "Centroids", "")
         ],
-        default='CENTROID_SAMPLING'
+        default='BLUE_NOISE_SAMPLING'
     )
     triangulation_points: bpy.props.IntProperty(
         name="Triangulation points",
         description="Number of triangulation points",
         default=1000
     )
+    single_pass: bpy.props.BoolProperty(
+        name="Single pass",
+        description="Derive the boundary edge length from the number of points instead of a calibration triangulation",
+        default=True
+    )
+    random_seed: bpy.props.IntProperty(
+        name="Random seed",
+        description="Seed for the random sampling methods, 0 for a new layout every time",
+        default=0,
+        min=0
+    )
+    batch_workers: bpy.props.IntProperty(
+        name="Worker processes",
+        description="Processes used by Triangulate Selected, 0 for one per core",
+        default=0,
+        min=0
+    )
     container_tolerance: bpy.props.FloatProperty(
         name="Container tolerance",
         description="Tolerance for checking if triangle is contained",
@@ -144,6 +213,22 @@ class SVGPasteSettings(bpy.types.PropertyGroup):
         soft_min=0.0,
         step=0.1
     )
+    log_timings: bpy.props.BoolProperty(
+        name="Log Timings",
+        description="Append the timings of every paste and triangulation as JSON lines to the log file",
+        default=False
+    )
+    timing_log_path: bpy.props.StringProperty(
+        name="Timing log",
+        description="JSON lines file the timings are appended to",
+        default="//svg_paste_timings.jsonl",
+        subtype='FILE_PATH'
+    )
+    trace_memory: bpy.props.BoolProperty(
+        name="Trace Memory",
+        description="Measure the peak memory of every stage with tracemalloc, which slows the pipeline down",
+        default=False
+    )
     keep_original: bpy.props.BoolProperty(
         name="Keep Original",
         description="Keep the original object",
@@ -167,7 +252,13 @@ class OBJECT_PT_SVGPastePanel(bpy.types.Panel):
         svg_paste = context.scene.svg_paste
 
         # Boolean inputs
+        layout.prop(svg_paste, "native_import")
+        if svg_paste.native_import:
+            layout.prop(svg_paste, "import_as_mesh")
+            layout.prop(svg_paste, "curve_tolerance")
         layout.prop(svg_paste, "convert_to_mesh_after_pasting")
+        if svg_paste.convert_to_mesh_after_pasting:
+            layout.prop(svg_paste, "join_after_converting")
         layout.prop(svg_paste, "triangulate_after_pasting")
 
         # Dropdown for triangulation method
@@ -183,6 +274,8 @@ class OBJECT_PT_SVGPastePanel(bpy.types.Panel):
         # Boolean input for keep_original, numper of points
         layout.prop(svg_paste, "keep_original")
         layout.prop(svg_paste, "triangulation_points")
+        layout.prop(svg_paste, "single_pass")
+        layout.prop(svg_paste, "random_seed")
         layout.prop(svg_paste, "container_tolerance")
 
         layout.separator()
@@ -190,6 +283,25 @@ class OBJECT_PT_SVGPastePanel(bpy.types.Panel):
 
         # Button to triangulate
         layout.operator("object.triangulate", text="Triangulate")
+        layout.operator("object.triangulate_modal", text="Triangulate in Background")
+        layout.operator("object.triangulate_selected", text="Triangulate Selected")
+        layout.prop(svg_paste, "batch_workers")
+        if "triangulate" in sys.modules:
+            stats = sys.modules["triangulate"].cache_stats()
+            layout.label(text="Cache: {} hits, {} misses".format(stats["hits"], stats["misses"]))
+
+        layout.separator()
+
+        # Timings of the last paste or triangulation
+        layout.prop(svg_paste, "log_timings")
+        if svg_paste.log_timings: layout.prop(svg_paste, "timing_log_path", text="")
+        layout.prop(svg_paste, "trace_memory")
+        if "triangulate" in sys.modules and sys.modules["triangulate"].instrument.last_run:
+            box = layout.box()
+            for span in sys.modules["triangulate"].instrument.last_run["spans"]:
+                counts = ", ".join("{} {}".format(v, k) for k, v in span.items() if k not in ("name", "duration", "calls", "peak_memory"))
+                memory = " {:.1f} MB".format(span["peak_memory"] / 2 ** 20) if span["peak_memory"] else ""
+                box.label(text="{}: {:.1f} ms{} {}".format(span["name"], 1000 * span["duration"], memory, counts))
 
         layout.separator()
 
@@ -204,7 +316,11 @@ class OBJECT_OT_PasteSVG(bpy.types.Operator):
     bl_label = "Paste SVG"
 
     def execute(self, context):
-        self.paste_svg(context)
+        instrument = begin_run(context, "paste")
+        try:
+            self.paste_svg(context)
+        finally:
+            instrument.end()
         return {'FINISHED'}
 
     def paste_svg(self, context):
@@ -219,7 +335,8 @@ class OBJECT_OT_PasteSVG(bpy.types.Operator):
             space = [a for a in bpy.context.screen.areas if a.type == "VIEW_3D" ][0].spaces.active
             if space.type == 'VIEW_3D':
                 view_plane = get_current_view_plane(space)
-                pasted_objs = import_svg_from_clipboard(view_plane)
+                if svg_paste.native_import: pasted_objs = paste_svg_in_memory(svg_paste.import_as_mesh, svg_paste.curve_tolerance)
+                else: pasted_objs = import_svg_from_clipboard(view_plane)
                 for o in pasted_objs:
                     rotate_svg_onto_plane(o, view_plane)        
         except Exception as e:
@@ -230,13 +347,8 @@ class OBJECT_OT_PasteSVG(bpy.types.Operator):
         print(pasted_objs)
         
         if svg_paste.convert_to_mesh_after_pasting:
-            start_objects = [ o.name for o in bpy.data.objects ]
-            for obj in pasted_objs:
-                bpy.context.view_layer.objects.active = obj
-                obj.select_set(True)
-                bpy.ops.object.convert(target='MESH')
-                # Call convert_to_mesh function
-            pasted_objs = [ o for o in bpy.data.objects if o.name not in start_objects ]
+            import triangulate
+            pasted_objs = triangulate.curves_to_meshes(pasted_objs, join=svg_paste.join_after_converting)
 
         if svg_paste.triangulate_after_pasting:
             start_objects = [ o.name for o in bpy.data.objects ]
@@ -257,15 +369,33 @@ class OBJECT_OT_ConvertToCurve(bpy.types.Operator):
         print("Converting to Curve...")
         # Your code to convert to curve goes here
 
+def resampled_poly(obj, svg_paste):
+    """
+    the polygon of obj (an object or a bmesh), its boundary resampled
+    to the edge length the triangulation settings aim for
+    """
+    import triangulate
+
+    poly = triangulate.obj_to_poly(obj)
+    # long boundary edges are split on the rings themselves, the
+    # edit-mesh is only touched by the final write
+    return triangulate.resample_to_count(poly, svg_paste.triangulation_points, calibrate=not svg_paste.single_pass)
+
 class OBJECT_OT_Triangulate(bpy.types.Operator):
     bl_idname = "object.triangulate"
     bl_label = "Triangulate"
 
     def execute(self, context):
-        self.triangulate_obj(context)
+        instrument = begin_run(context, "triangulate")
+        try:
+            self.triangulate_obj(context)
+        finally:
+            instrument.end()
         return {'FINISHED'}
 
     def triangulate_obj(self, context):
+        import triangulate
+
         svg_paste = context.scene.svg_paste
         obj = bpy.context.active_object
         saved_mode = obj.mode
@@ -273,48 +403,154 @@ class OBJECT_OT_Triangulate(bpy.types.Operator):
         triangulation_method = svg_paste.triangulation_method.lower()
         bpy.ops.ed.undo_push(message=f"Triangulating with method: {triangulation_method}...")
         
-        poly = triangulate.obj_to_poly(obj)
-        points = getattr(triangulate, "random_points_sampling")(poly, svg_paste.triangulation_points) # like triangulate.some_method(blah, blah)
-        mesh = triangulate.triangulate_poly_and_points(poly, points)
-
-        bm_t = bmesh.new()
-        bm_t.from_mesh(mesh)
-        edges_inside = [ e for e in bm_t.edges if len(e.link_faces) > 1]
-        avg_length_inside = sum([ e.calc_length() for e in edges_inside]) / len(edges_inside)
-        bm_t.free()
-        
+        bm_s = bmesh.from_edit_mesh(obj.data)
+        poly = resampled_poly(bm_s, svg_paste)
 
+        tm = triangulate.triangulate_islands(poly, triangulation_method, svg_paste.triangulation_points, seed=svg_paste.random_seed or None)
 
-        bm_s = bmesh.from_edit_mesh(obj.data)
-        bm_s.edges.ensure_lookup_table()
-        print("Vertices before subdiv: {}".format(len(obj.data.vertices)))
-        print("Vertices in bmesh before subdiv: {}".format(len(bm_s.verts)))
-        
-        edges_outside = [ e for e in bm_s.edges if len(e.link_faces) <= 1]
+        # write straight into the object's mesh, which needs object mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+        triangulate.trimesh_to_mesh(tm, obj.data)
+        if obj.mode != saved_mode: bpy.ops.object.mode_set(mode=saved_mode)
 
-        for e in [ e for e in edges_outside if e.calc_length() >= 2 * avg_length_inside ]:
-            d = int(e.calc_length() / avg_length_inside)
-            bmesh.ops.subdivide_edges(bm_s, edges=[e], cuts=d, use_grid_fill=True)
 
-        print("Vertices in bmesh after subdiv: {}".format(len(bm_s.verts)))
-        bmesh.update_edit_mesh(obj.data)
-        obj.update_from_editmode()
-        print("Vertices after subdiv: {}".format(len(obj.data.vertices)))
-        poly = triangulate.obj_to_poly(bm_s)
-        bm_s.free()        
+class OBJECT_OT_TriangulateModal(bpy.types.Operator):
+    """
+    Triangulate on a background thread, with progress, Esc to cancel
+    """
+    bl_idname = "object.triangulate_modal"
+    bl_label = "Triangulate in Background"
 
-        points = getattr(triangulate, triangulation_method)(poly, svg_paste.triangulation_points) # like triangulate.some_method(blah, blah)
-        mesh = triangulate.triangulate_poly_and_points(poly, points)
-        
-        bm_u = bmesh.from_edit_mesh(obj.data)
-        bm_u.clear()
-        bm_u.from_mesh(mesh)
-        bmesh.update_edit_mesh(obj.data)
-        bm_u.free()
-        if obj.mode != saved_mode: bpy.ops.object.mode_set(mode=saved_mode)
+    def invoke(self, context, event):
+        import threading
+        import triangulate
 
+        svg_paste = context.scene.svg_paste
+        obj = context.active_object
+        if obj is None or obj.type != 'MESH':
+            self.report({'ERROR'}, "Select a mesh to triangulate")
+            return {'CANCELLED'}
+
+        # everything touching bpy happens here, the worker only does geometry
+        if obj.mode == 'EDIT': obj.update_from_editmode()
+        poly = resampled_poly(obj, svg_paste)
+        self.instrument = begin_run(context, "triangulate")
+        method = svg_paste.triangulation_method.lower()
+        count = svg_paste.triangulation_points
+        seed = svg_paste.random_seed or None
+
+        self.obj_name = obj.name
+        self.cancel_event = threading.Event()
+        self.progress = 0.0
+        self.result = {}
+
+        def set_progress(done, total): self.progress = done / total
+
+        def work():
+            try:
+                self.result["mesh"] = triangulate.triangulate_islands(poly, method, count, seed=seed, progress=set_progress, cancel=self.cancel_event)
+            except triangulate.Cancelled:
+                pass
+            except Exception as e:
+                self.result["error"] = e
+
+        self.thread = threading.Thread(target=work, daemon=True)
+        self.thread.start()
+
+        wm = context.window_manager
+        self.timer = wm.event_timer_add(0.1, window=context.window)
+        wm.progress_begin(0, 100)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.cancel_event.set()
+            self.finish(context)
+            self.report({'INFO'}, "Triangulation cancelled")
+            return {'CANCELLED'}
+
+        if event.type != 'TIMER': return {'PASS_THROUGH'}
+
+        if self.thread.is_alive():
+            context.window_manager.progress_update(int(100 * self.progress))
+            context.workspace.status_text_set("Triangulating: {:.0f}% (Esc to cancel)".format(100 * self.progress))
+            return {'PASS_THROUGH'}
+
+        if "error" in self.result:
+            self.finish(context)
+            self.report({'ERROR'}, "Triangulation failed: {}".format(self.result["error"]))
+            return {'CANCELLED'}
+
+        obj = bpy.data.objects.get(self.obj_name)
+        if obj is None or "mesh" not in self.result:
+            self.finish(context)
+            return {'CANCELLED'}
+
+        import triangulate
+        try:
+            saved_mode = obj.mode
+            bpy.ops.ed.undo_push(message="Triangulating in background...")
+            if obj.mode != 'OBJECT': bpy.ops.object.mode_set(mode='OBJECT')
+            triangulate.trimesh_to_mesh(self.result["mesh"], obj.data)
+            if obj.mode != saved_mode: bpy.ops.object.mode_set(mode=saved_mode)
+        finally:
+            self.finish(context)
+        return {'FINISHED'}
+
+    def finish(self, context):
+        # every way out of the operator goes through here, so the run is
+        # always closed
+        wm = context.window_manager
+        wm.event_timer_remove(self.timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+        self.instrument.end()
+
+class OBJECT_OT_TriangulateSelected(bpy.types.Operator):
+    """
+    Triangulate every selected mesh on a pool of worker processes
+    """
+    bl_idname = "object.triangulate_selected"
+    bl_label = "Triangulate Selected"
+
+    def execute(self, context):
+        import triangulate
+
+        svg_paste = context.scene.svg_paste
+        objects = [ o for o in context.selected_objects if o.type == 'MESH' ]
+        if not objects:
+            self.report({'ERROR'}, "Select meshes to triangulate")
+            return {'CANCELLED'}
+
+        saved_mode = context.mode
+        if context.mode != 'OBJECT': bpy.ops.object.mode_set(mode='OBJECT')
+        method = svg_paste.triangulation_method.lower()
+        bpy.ops.ed.undo_push(message=f"Triangulating {len(objects)} objects with method: {method}...")
+
+        instrument = begin_run(context, "triangulate selected")
+        wm = context.window_manager
+        wm.progress_begin(0, len(objects))
+        try:
+            pairs = [ (o, triangulate.obj_to_poly(o)) for o in objects ]
+            pairs = [ (o, p) for o, p in pairs if p is not None ]
+            meshes = triangulate.triangulate_many(
+                [ p for _, p in pairs ], method, svg_paste.triangulation_points,
+                calibrate=not svg_paste.single_pass,
+                workers=svg_paste.batch_workers or None,
+                seed=svg_paste.random_seed or None,
+                progress=lambda done, total: wm.progress_update(done),
+            )
+            # all results are in, write them back in one go
+            for (obj, _), tm in zip(pairs, meshes): triangulate.trimesh_to_mesh(tm, obj.data)
+        finally:
+            wm.progress_end()
+            instrument.end()
+
+        if saved_mode == 'EDIT_MESH': bpy.ops.object.mode_set(mode='EDIT')
+        self.report({'INFO'}, "Triangulated {} objects".format(len(pairs)))
+        return {'FINISHED'}
 
-        
 class OBJECT_OT_AlignAndResize(bpy.types.Operator):
     bl_idname = "object.align_and_resize"
     bl_label = "Align and Resize"
@@ -337,6 +573,8 @@ def register():
     bpy.utils.register_class(OBJECT_OT_PasteSVG)
     bpy.utils.register_class(OBJECT_OT_ConvertToCurve)
     bpy.utils.register_class(OBJECT_OT_Triangulate)
+    bpy.utils.register_class(OBJECT_OT_TriangulateModal)
+    bpy.utils.register_class(OBJECT_OT_TriangulateSelected)
     bpy.utils.register_class(OBJECT_OT_AlignAndResize)
 
 def unregister():
@@ -347,7 +585,12 @@ def unregister():
     bpy.utils.unregister_class(OBJECT_OT_PasteSVG)
     bpy.utils.unregister_class(OBJECT_OT_ConvertToCurve)
     bpy.utils.unregister_class(OBJECT_OT_Triangulate)
+    bpy.utils.unregister_class(OBJECT_OT_TriangulateModal)
+    bpy.utils.unregister_class(OBJECT_OT_TriangulateSelected)
     bpy.utils.unregister_class(OBJECT_OT_AlignAndResize)
 
+    # the worker processes would otherwise outlive the add-on
+    if "triangulate" in sys.modules: sys.modules["triangulate"].shutdown_pool()
+
 if __name__ == "__main__":
     register()
@@ -0,0 +1,181 @@
+"""
+thin adapter between Blender meshes and the bpy-free geometry core
+"""
+import bpy
+import bmesh
+import numpy as np
+
+from .trimesh import TriMesh, boundary_loops
+from .pipeline import loops_to_poly, svg_to_polys
+from .delaunay import constrained_triangulation
+from .svg import parse_svg, PX_TO_M
+from .instrument import span
+
+def get_ordered_boundary_edges(obj):
+    with span("boundary extraction") as s:
+        if isinstance(obj, bmesh.types.BMesh):
+            obj.verts.index_update()
+            coords = np.array([ v.co[:2] for v in obj.verts ])
+            edges = np.array([ (e.verts[0].index, e.verts[1].index) for e in obj.edges if len(e.link_faces) < 2 ])
+        else:
+            mesh = obj.data
+            coords = np.empty(3 * len(mesh.vertices))
+            mesh.vertices.foreach_get("co", coords)
+            edges = np.empty(2 * len(mesh.edges), dtype=np.int64)
+            mesh.edges.foreach_get("vertices", edges)
+            loop_edges = np.empty(len(mesh.loops), dtype=np.int64)
+            mesh.loops.foreach_get("edge_index", loop_edges)
+
+            # boundary edges are the ones with fewer than two linked faces
+            face_count = np.bincount(loop_edges, minlength=len(mesh.edges))
+            coords = coords.reshape(-1, 3)
+            edges = edges.reshape(-1, 2)[face_count < 2]
+
+        loops = boundary_loops(edges, coords)
+        s["edges"] = len(edges)
+        s["loops"] = len(loops)
+    return loops
+
+def obj_to_poly(obj):
+    boundary_loops = [ l for l in get_ordered_boundary_edges(obj) if len(l) >= 3 ]
+    if not boundary_loops: return None
+    return loops_to_poly(boundary_loops)
+
+def trimesh_to_mesh(tm, mesh=None, name="New Object Mesh"):
+    """
+    writes a TriMesh into mesh (a new datablock if None) with foreach_set
+    """
+    with span("mesh write-back") as s:
+        if mesh is None: mesh = bpy.data.meshes.new(name=name)
+        else: mesh.clear_geometry()
+
+        mesh.vertices.add(len(tm.vertices))
+        mesh.loops.add(len(tm.indices))
+        mesh.polygons.add(len(tm))
+        mesh.vertices.foreach_set("co", tm.vertices.ravel())
+        mesh.loops.foreach_set("vertex_index", tm.indices)
+        mesh.polygons.foreach_set("loop_start", tm.loop_starts)
+        # loop_total is derived from loop_start since Blender 4.0
+        if bpy.app.version < (4, 0, 0): mesh.polygons.foreach_set("loop_total", tm.loop_totals)
+        mesh.update(calc_edges=True)
+        s["vertices"] = len(tm.vertices)
+        s["faces"] = len(tm)
+    return mesh
+
+def svg_to_curve_objects(data, name="Pasted Object"):
+    """
+    builds one 2D Bézier curve object per drawable element of the SVG
+    bytes data, in a new collection called name, and returns them
+    """
+    with span("svg import") as s:
+        collection = bpy.data.collections.new(name)
+        bpy.context.scene.collection.children.link(collection)
+
+        objects = []
+        for shape in parse_svg(data):
+            curve = bpy.data.curves.new(shape.id, 'CURVE')
+            curve.dimensions = '2D'
+            curve.fill_mode = 'BOTH'
+
+            for segments, closed in shape.subpaths:
+                # SVG is y-down, in px
+                segments = segments * (PX_TO_M, -PX_TO_M)
+                co = segments[:, 0] if closed else np.vstack([ segments[:, 0], segments[-1:, 3] ])
+                right = segments[:, 1] if closed else np.vstack([ segments[:, 1], segments[-1:, 3] ])
+                left = np.roll(segments[:, 2], 1, axis=0) if closed else np.vstack([ segments[:1, 0], segments[:, 2] ])
+
+                spline = curve.splines.new('BEZIER')
+                spline.bezier_points.add(len(co) - 1)
+                for attr, values in (("co", co), ("handle_left", left), ("handle_right", right)):
+                    spline.bezier_points.foreach_set(attr, np.column_stack([ values, np.zeros(len(values)) ]).ravel())
+                for attr in ("handle_left_type", "handle_right_type"):
+                    for point in spline.bezier_points: setattr(point, attr, 'FREE')
+                spline.use_cyclic_u = closed
+
+            obj = bpy.data.objects.new(shape.id, curve)
+            obj["fill-rule"] = shape.fill_rule
+            collection.objects.link(obj)
+            objects.append(obj)
+        s["objects"] = len(objects)
+    return objects
+
+def svg_to_mesh_objects(data, tolerance=0.0001, name="Pasted Object"):
+    """
+    builds one filled mesh object per drawable element of the SVG bytes
+    data, flattening curves to within tolerance (in metres) straight
+    into polygons, in a new collection called name, and returns them
+    """
+    with span("svg import") as s:
+        collection = bpy.data.collections.new(name)
+        bpy.context.scene.collection.children.link(collection)
+
+        objects = []
+        for shape, poly in svg_to_polys(data, tolerance / PX_TO_M):
+            vertices, triangles = constrained_triangulation(poly, np.empty((0, 2)), shape_buffer=1e-9)
+            # SVG is y-down, in px: flipping y also flips the winding back
+            tm = TriMesh.from_triangles(vertices * (PX_TO_M, -PX_TO_M), triangles[:, ::-1])
+
+            obj = bpy.data.objects.new(shape.id, trimesh_to_mesh(tm, name=shape.id))
+            collection.objects.link(obj)
+            objects.append(obj)
+        s["objects"] = len(objects)
+    return objects
+
+def curves_to_meshes(objects, join=False, name="Pasted Object"):
+    """
+    converts curve objects to mesh objects in one pass over the
+    evaluated depsgraph, without the convert operator. The curves are
+    replaced by new objects with the same names, collections and
+    transforms, which are returned; with join by a single object
+    holding all of them, in the space of the first curve
+    """
+    with span("convert") as s:
+        curves = [ o for o in objects if o.type == 'CURVE' ]
+        others = [ o for o in objects if o.type != 'CURVE' ]
+        if not curves: return others
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+
+        # (name, matrix, collections, mesh) for every object to create
+        meshes = []
+        for obj in curves:
+            mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph), depsgraph=depsgraph)
+            meshes.append((obj.name, obj.matrix_basis.copy(), list(obj.users_collection), mesh))
+
+        if join:
+            bm = bmesh.new()
+            base = meshes[0][1].inverted()
+            # material slots of all the curves, shared ones only once;
+            # each mesh's face indices are remapped onto them first
+            materials = []
+            for _, matrix, _, mesh in meshes:
+                slots = []
+                for material in mesh.materials:
+                    if material not in materials: materials.append(material)
+                    slots.append(materials.index(material))
+                if slots:
+                    index = np.empty(len(mesh.polygons), dtype=np.int32)
+                    mesh.polygons.foreach_get("material_index", index)
+                    mesh.polygons.foreach_set("material_index", np.array(slots, dtype=np.int32)[np.minimum(index, len(slots) - 1)])
+                mesh.transform(base @ matrix)
+                bm.from_mesh(mesh)
+                bpy.data.meshes.remove(mesh)
+            mesh = bpy.data.meshes.new(name)
+            bm.to_mesh(mesh)
+            bm.free()
+            for material in materials: mesh.materials.append(material)
+            meshes = [ (name, meshes[0][1], meshes[0][2], mesh) ]
+
+        for obj in curves:
+            data = obj.data
+            bpy.data.objects.remove(obj, do_unlink=True)
+            if not data.users: bpy.data.curves.remove(data)
+
+        converted = []
+        for obj_name, matrix, collections, mesh in meshes:
+            mesh.name = obj_name
+            obj = bpy.data.objects.new(obj_name, mesh)
+            obj.matrix_basis = matrix
+            for collection in collections: collection.objects.link(obj)
+            converted.append(obj)
+        s["objects"] = len(converted)
+    return others + converted
@@ -0,0 +1,75 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import shapely
+
+def poly_key(poly):
+    """
+    content address of a polygon: the hash of its WKB
+    """
+    return hashlib.sha1(shapely.to_wkb(poly)).hexdigest()
+
+def nbytes(value):
+    if isinstance(value, np.ndarray): return value.nbytes
+    if isinstance(value, (tuple, list)): return sum(nbytes(v) for v in value)
+    if hasattr(value, "__dict__"): return nbytes(list(vars(value).values()))
+    return 0
+
+class LRUCache:
+    """
+    least recently used cache bounded by the bytes of the arrays it holds
+    """
+    def __init__(self, maxbytes=256 * 1024 * 1024):
+        self.maxbytes = maxbytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self): return len(self._items)
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._items.move_to_end(key)
+            return self._items[key][0]
+
+    def put(self, key, value):
+        size = nbytes(value)
+        with self._lock:
+            if key in self._items: self.size -= self._items.pop(key)[1]
+            if size > self.maxbytes: return value
+            self._items[key] = (value, size)
+            self.size += size
+            while self.size > self.maxbytes:
+                _, (_, s) = self._items.popitem(last=False)
+                self.size -= s
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+
+samples_cache = LRUCache()
+meshes_cache = LRUCache()
+
+def cache_stats():
+    return {
+        "hits": samples_cache.hits + meshes_cache.hits,
+        "misses": samples_cache.misses + meshes_cache.misses,
+        "entries": len(samples_cache) + len(meshes_cache),
+        "bytes": samples_cache.size + meshes_cache.size,
+    }
+
+def clear_caches():
+    samples_cache.clear()
+    meshes_cache.clear()
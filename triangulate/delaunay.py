@@ -0,0 +1,128 @@
+import math
+import numpy as np
+import shapely
+
+from .trimesh import TriMesh
+
+def poly_coords(poly):
+    """
+    returns the vertices of every ring of poly as one (N, 2) array,
+    without the closing coordinates
+    """
+    rings = shapely.get_rings(shapely.get_parts(poly))
+    return np.vstack([ np.asarray(r.coords)[:-1, :2] for r in rings ])
+
+def constrained_triangulation(poly, points, shape_buffer=0.001):
+    """
+    triangulates points together with the rings of poly, so that every
+    face is a true triangle inside the polygon. Edges may stray out of
+    it by shape_buffer times the mean point spacing, no more.
+    returns (vertices, triangles) as a (N, 2) float array and a (T, 3)
+    index array into it, every vertex used by some triangle
+    """
+    from scipy.spatial import Delaunay
+
+    minx, miny, maxx, maxy = poly.bounds
+    l = max([maxx - minx, maxy - miny])
+    shapely.prepare(poly)
+
+    pts = np.vstack([ np.asarray(points, dtype=float).reshape(-1, 2), poly_coords(poly) ])
+    pts = np.unique(pts, axis=0)
+    triangles = Delaunay(pts).simplices
+
+    # the tolerance follows the spacing, so that denser points do not
+    # let faces cut deeper into holes and concave corners
+    r = poly.buffer(shape_buffer * math.sqrt(poly.area / len(pts)))
+    shapely.prepare(r)
+
+    # keep the triangles whose three edges stay inside the (barely
+    # buffered) polygon: as no point lies inside a Delaunay triangle,
+    # neither can a hole, short of a triangular hole being one of them,
+    # which its centroid catches
+    edges = pts[triangles[:, [0, 1, 1, 2, 2, 0]]].reshape(-1, 2, 2)
+    inside = shapely.covers(r, shapely.linestrings(edges)).reshape(-1, 3).all(axis=1)
+    centroids = pts[triangles].mean(axis=1)
+    inside &= shapely.contains_xy(poly, centroids[:, 0], centroids[:, 1])
+    kept, rejected = triangles[inside], triangles[~inside]
+    if not len(rejected): return used_only(pts, kept)
+
+    # the rest crosses the boundary, near concave corners: clip that
+    # region to the polygon and let GEOS triangulate it with the rings
+    # as constraints. Its vertices are mostly points we already have
+    gaps = shapely.intersection(poly, shapely.union_all(shapely.polygons(pts[rejected])))
+    gaps = shapely.get_parts(shapely.make_valid(gaps))
+    gaps = gaps[shapely.get_type_id(gaps) == shapely.GeometryType.POLYGON]
+    # slivers only upset GEOS, their area is below float noise anyway
+    gaps = gaps[shapely.area(gaps) > 1e-12 * l * l]
+    if not len(gaps): return used_only(pts, kept)
+
+    extra = gap_triangles(gaps)
+    vertices, index = np.unique(np.vstack([ pts, extra.reshape(-1, 2) ]), axis=0, return_inverse=True)
+    index = index.ravel()
+    triangles = np.vstack([ index[kept], index[len(pts):].reshape(-1, 3) ])
+    return used_only(vertices, triangles)
+
+def used_only(vertices, triangles):
+    """
+    drops the vertices no triangle uses, e.g. sample points that only
+    belonged to rejected triangles, which would be loose in the mesh
+    """
+    used, index = np.unique(triangles, return_inverse=True)
+    return vertices[used], index.reshape(-1, 3)
+
+def counter_clockwise(triangles):
+    """
+    (T, 3, 2) triangles with the clockwise ones flipped, Delaunay's winding
+    """
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    cw = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0]) < 0
+    triangles[cw] = triangles[cw][:, ::-1]
+    return triangles
+
+def gap_triangles(gaps):
+    """
+    (T, 3, 2) counter-clockwise triangles filling the polygons gaps,
+    by GEOS constrained Delaunay, gap by gap where it refuses all of
+    them at once, and by clipping a plain Delaunay triangulation to
+    the gaps it refuses on their own
+    """
+    def cdt(geometry):
+        extra = shapely.get_parts(shapely.constrained_delaunay_triangles(geometry))
+        return shapely.get_coordinates(shapely.get_exterior_ring(extra)).reshape(-1, 4, 2)[:, :3]
+
+    try:
+        return counter_clockwise(cdt(shapely.multipolygons(gaps)))
+    except shapely.errors.GEOSException:
+        pass
+
+    extra = []
+    for gap in gaps:
+        try:
+            extra.append(cdt(gap))
+            continue
+        except shapely.errors.GEOSException:
+            pass
+        pieces = shapely.get_parts(shapely.intersection(gap, shapely.get_parts(shapely.delaunay_triangles(gap))))
+        pieces = pieces[(shapely.get_type_id(pieces) == shapely.GeometryType.POLYGON) & (shapely.area(pieces) > 0)]
+        # clipped triangles are near enough convex to fan from a corner
+        for ring in shapely.get_exterior_ring(pieces):
+            coords = np.asarray(ring.coords)[:-1, :2]
+            extra.append(np.stack([ np.repeat(coords[:1], len(coords) - 2, axis=0), coords[1:-1], coords[2:] ], axis=1))
+    return counter_clockwise(np.vstack(extra) if extra else np.empty((0, 3, 2)))
+
+def triangulate_poly_and_points(poly, points, shape_buffer=0.001, constrained=True):
+    if constrained:
+        verts, faces = constrained_triangulation(poly, points, shape_buffer)
+        return TriMesh.from_triangles(verts, faces)
+
+    pts = np.vstack([ np.asarray(points, dtype=float).reshape(-1, 2), poly_coords(poly) ])
+
+    triangles = [ t for t in shapely.ops.triangulate(shapely.MultiPoint(pts)) ]
+    triangles = [ shapely.intersection(poly, t) for t in triangles ]
+    
+    for t in [t for t in triangles if t.geom_type in [ "MultiPolygon", "GeometryCollection" ]]:
+        for t in [ t for t in list(t.geoms) if t.geom_type == "Polygon"]:
+            triangles.append(t)
+
+    triangles = [t for t in triangles if t.geom_type == "Polygon" and not t.is_empty ]
+    return TriMesh.from_polygons([ np.asarray(t.exterior.coords)[:-1] for t in triangles ])
@@ -0,0 +1,117 @@
+"""
+per-stage timing and memory spans for the paste -> mesh -> triangulate
+pipeline. Spans are only recorded between begin() and end(); spans with
+the same name within a run (e.g. one per island) are merged. Spans may
+nest and overlap across threads: the duration of a run is its own wall
+clock, not the sum of its spans
+"""
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # not on Windows
+    resource = None
+
+_lock = threading.Lock()
+_run = None
+# traced memory peaks of the spans still open, see _fold_peak
+_open = {}
+last_run = None
+
+def max_rss():
+    """
+    peak resident set size of the process in bytes, if known
+    """
+    if resource is None: return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return rss if sys.platform == "darwin" else rss * 1024
+
+def begin(name, trace_memory=False, log_path=None):
+    """
+    starts a run; with trace_memory, spans record the peak memory traced
+    by tracemalloc (which slows allocations down). Without it spans have
+    no memory figure, the run only keeps the peak resident size of the
+    whole process, which is not specific to any stage
+    """
+    global _run
+    if trace_memory and not tracemalloc.is_tracing(): tracemalloc.start()
+    with _lock:
+        _run = {
+            "name": name,
+            "time": time.time(),
+            "start": time.perf_counter(),
+            "spans": {},
+            "trace_memory": trace_memory,
+            "log_path": log_path,
+        }
+
+def end():
+    """
+    closes the run, appends it as one JSON line to its log file if it
+    has one and returns it
+    """
+    global _run, last_run
+    with _lock:
+        run, _run = _run, None
+    if run is None: return None
+    if run["trace_memory"] and tracemalloc.is_tracing(): tracemalloc.stop()
+
+    run["spans"] = list(run["spans"].values())
+    run["duration"] = time.perf_counter() - run.pop("start")
+    run["max_rss"] = max_rss()
+    log_path = run.pop("log_path")
+    if log_path:
+        with open(log_path, "a") as f: f.write(json.dumps(run) + "\n")
+    last_run = run
+    return run
+
+@contextmanager
+def span(name, **counts):
+    """
+    times the block; the yielded dict takes counts to record with it,
+    e.g. with span("sampling") as s: s["points"] = len(points)
+    """
+    if _run is None:
+        yield counts
+        return
+
+    tracing = _run["trace_memory"] and tracemalloc.is_tracing()
+    if tracing:
+        token = object()
+        with _lock:
+            # the tracer has a single peak: hand it to the spans already
+            # open before restarting it for this one
+            _fold_peak()
+            tracemalloc.reset_peak()
+            _open[token] = 0
+    start = time.perf_counter()
+    try:
+        yield counts
+    finally:
+        duration = time.perf_counter() - start
+        peak = None
+        if tracing:
+            with _lock:
+                _fold_peak()
+                peak = _open.pop(token)
+        record(name, duration, peak, counts)
+
+def _fold_peak():
+    peak = tracemalloc.get_traced_memory()[1]
+    for token in _open: _open[token] = max(_open[token], peak)
+
+def record(name, duration, peak=None, counts=None):
+    with _lock:
+        if _run is None: return
+        s = _run["spans"].setdefault(name, { "name": name, "duration": 0.0, "calls": 0, "peak_memory": None })
+        s["duration"] += duration
+        s["calls"] += 1
+        if peak is not None: s["peak_memory"] = max(peak, s["peak_memory"] or 0)
+        for k, v in (counts or {}).items(): s[k] = s.get(k, 0) + v
@@ -0,0 +1,198 @@
+import os
+import inspect
+import numpy as np
+import shapely
+from shapely import Polygon, MultiPolygon
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import sampling
+from .delaunay import constrained_triangulation, triangulate_poly_and_points
+from .trimesh import TriMesh
+from .cache import poly_key, samples_cache, meshes_cache
+from .svg import parse_svg
+from .instrument import span
+
+def loops_to_poly(loops, fill_rule="evenodd"):
+    """
+    builds a MultiPolygon out of closed (k, 2) loops. With the evenodd
+    rule loops inside an even number of others are exteriors, the
+    others are holes of the loop directly around them; with nonzero the
+    region directly inside a loop is filled if the winding numbers of
+    the loops around it, itself included, do not cancel out
+    """
+    rings = [ Polygon(l) for l in loops ]
+    shapely.prepare(rings)
+    probes = np.array([ l[0] for l in loops ], dtype=float)
+
+    # inside[i, j]: loop j lies inside loop i
+    inside = np.array([ shapely.contains_xy(r, probes[:, 0], probes[:, 1]) for r in rings ])
+    np.fill_diagonal(inside, False)
+    depth = inside.sum(axis=0)
+
+    if fill_rule == "nonzero":
+        direction = np.where(shapely.is_ccw([ r.exterior for r in rings ]), 1, -1)
+        filled = (direction @ inside + direction) != 0
+    else:
+        filled = depth % 2 == 0
+
+    polygons = []
+    for i in np.flatnonzero(filled):
+        holes = [ loops[j] for j in np.flatnonzero(inside[i] & (depth == depth[i] + 1)) ]
+        polygons.append(Polygon(loops[i], holes))
+
+    # self-intersecting loops are drawn as bow ties, degenerate ones as
+    # lines: make_valid turns the former into their pieces and the
+    # latter into lines, which are dropped
+    polygons = shapely.get_parts(shapely.make_valid(polygons))
+    polygons = polygons[shapely.get_type_id(polygons) == shapely.GeometryType.POLYGON]
+    if fill_rule == "nonzero" and len(polygons):
+        return MultiPolygon(list(shapely.get_parts(shapely.union_all(polygons))))
+    return MultiPolygon(list(polygons))
+
+def svg_to_polys(data, tolerance=0.1):
+    """
+    reads SVG bytes straight into (shape, MultiPolygon) pairs, flattening
+    curves to within tolerance (in SVG user units) without any curve
+    object in between
+    """
+    polys = []
+    for shape in parse_svg(data):
+        loops = shape.loops(tolerance)
+        if not loops: continue
+        poly = loops_to_poly(loops, shape.fill_rule)
+        # open strokes and straight polylines have nothing to fill
+        if poly.area > 0: polys.append((shape, poly))
+    return polys
+
+def resample_ring(ring, spacing):
+    """
+    inserts points along a closed (k, 2) ring so that no segment is
+    longer than about spacing; segments shorter than twice the spacing
+    are left alone, like the edge subdivision this replaces
+    """
+    ring = np.asarray(ring, dtype=float)[:, :2]
+    if np.allclose(ring[0], ring[-1]): ring = ring[:-1]
+    if spacing <= 0: return ring
+    segments = np.roll(ring, -1, axis=0) - ring
+    lengths = np.hypot(segments[:, 0], segments[:, 1])
+    cuts = np.where(lengths >= 2 * spacing, (lengths / spacing).astype(int), 0)
+
+    # every segment contributes its start plus its cuts, evenly spaced
+    owner = np.repeat(np.arange(len(ring)), cuts + 1)
+    step = np.arange(len(owner)) - np.repeat(np.cumsum(cuts + 1) - (cuts + 1), cuts + 1)
+    t = step / (cuts + 1)[owner]
+    return ring[owner] + t[:, None] * segments[owner]
+
+def resample_poly(poly, spacing):
+    """
+    resamples every ring of every part of poly, see resample_ring
+    """
+    parts = []
+    for p in shapely.get_parts(poly):
+        parts.append(Polygon(
+            resample_ring(p.exterior.coords, spacing),
+            [ resample_ring(r.coords, spacing) for r in p.interiors ],
+        ))
+    return MultiPolygon(parts)
+
+def resample_to_count(poly, count, calibrate=False):
+    """
+    resamples poly to the edge length a triangulation with count points
+    is expected to have; with calibrate that length is measured on a
+    throwaway triangulation of random points instead of derived from
+    the area
+    """
+    if calibrate:
+        tm = triangulate_poly_and_points(poly, sampling.random_points_sampling(poly, count))
+        spacing = tm.mean_interior_edge_length()
+    else:
+        spacing = sampling.target_edge_length(poly, count)
+    return resample_poly(poly, spacing)
+
+def reproducible(method, seed):
+    """
+    whether the sampler called method gives the same points every time
+    with seed: grids always do, random samplers only with a seed, and
+    only reproducible results are cached
+    """
+    return seed is not None or "seed" not in inspect.signature(getattr(sampling, method)).parameters
+
+def sample_points(poly, method, count, seed=None, key=None, progress=None):
+    """
+    runs the sampler called method, going through the samples cache.
+    seed goes to the samplers that are random, progress(fraction) to
+    the ones that iterate
+    """
+    cached = reproducible(method, seed)
+    key = (key or poly_key(poly), method, count, seed)
+    points = samples_cache.get(key) if cached else None
+    if points is None:
+        with span("sampling") as s:
+            sampler = getattr(sampling, method)
+            parameters = inspect.signature(sampler).parameters
+            kwargs = {}
+            if seed is not None and "seed" in parameters: kwargs["seed"] = seed
+            if progress is not None and "progress" in parameters: kwargs["progress"] = progress
+            points = sampler(poly, count, **kwargs) if count > 0 else np.empty((0, 2))
+            s["points"] = len(points)
+        if cached: samples_cache.put(key, points)
+    return points
+
+def sample_and_triangulate(poly, method, count, shape_buffer=0.001, seed=None, progress=None):
+    key = poly_key(poly)
+    cached = reproducible(method, seed)
+    mesh = meshes_cache.get((key, method, count, seed, shape_buffer)) if cached else None
+    if mesh is not None: return mesh
+
+    points = sample_points(poly, method, count, seed, key, progress)
+    with span("triangulation") as s:
+        vertices, triangles = constrained_triangulation(poly, points, shape_buffer)
+        s["triangles"] = len(triangles)
+    mesh = TriMesh.from_triangles(vertices, triangles)
+    return meshes_cache.put((key, method, count, seed, shape_buffer), mesh) if cached else mesh
+
+class Cancelled(Exception):
+    pass
+
+def triangulate_islands(poly, method, count, shape_buffer=0.001, workers=None, seed=None, progress=None, cancel=None):
+    """
+    samples and triangulates every island of poly on its own, with
+    count split between them by area, on a thread pool (shapely, numpy
+    and qhull do their heavy lifting outside the GIL), and merges the
+    results into one TriMesh.
+    progress(done, total) is called as sampling goes and as islands
+    finish, weighted by their point counts; setting the threading.Event
+    cancel stops sampling at its next round and raises Cancelled
+    """
+    islands = [ p for p in shapely.get_parts(poly) if p.area > 0 ]
+    if not islands: return TriMesh.concatenate([])
+
+    areas = np.array([ p.area for p in islands ])
+    counts = np.round(count * areas / areas.sum()).astype(int).tolist()
+    total = sum(counts) or 1
+    # how far along each island is, sampling being the bulk of the work
+    fractions = [ 0.0 ] * len(islands)
+
+    def report(i, fraction):
+        fractions[i] = fraction
+        if progress is not None: progress(sum(f * n for f, n in zip(fractions, counts)), total)
+
+    def run(i, island, n):
+        def step(fraction):
+            if cancel is not None and cancel.is_set(): raise Cancelled()
+            report(i, 0.9 * fraction)
+
+        step(0.0)
+        return sample_and_triangulate(island, method, n, shape_buffer, seed, step)
+
+    with ThreadPoolExecutor(max_workers=1 if len(islands) == 1 else workers or os.cpu_count()) as pool:
+        futures = { pool.submit(run, i, island, n): i for i, (island, n) in enumerate(zip(islands, counts)) }
+        meshes = [ None ] * len(islands)
+        for future in as_completed(futures):
+            i = futures[future]
+            meshes[i] = future.result()
+            report(i, 1.0)
+            if cancel is not None and cancel.is_set():
+                for f in futures: f.cancel()
+                raise Cancelled()
+    return TriMesh.concatenate(meshes)
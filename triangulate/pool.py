@@ -0,0 +1,72 @@
+"""
+a process pool that outlives a single operator call, for triangulating
+many objects at once. Workers are spawned (forking Blender is not safe)
+and import the geometry core once, so only the first batch pays for it
+"""
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from .pipeline import Cancelled, resample_to_count, triangulate_islands
+from .instrument import span
+
+_lock = threading.Lock()
+_pool = None
+_workers = None
+
+def _warm_up():
+    # pulls in scipy's qhull bindings ahead of the first real job
+    from scipy.spatial import Delaunay
+
+def _triangulate(poly, method, count, calibrate, shape_buffer, seed):
+    poly = resample_to_count(poly, count, calibrate)
+    # one island at a time, the pool already keeps every core busy
+    return triangulate_islands(poly, method, count, shape_buffer, workers=1, seed=seed)
+
+def get_pool(workers=None):
+    """
+    the shared pool, started on first use or when the number of workers
+    changes
+    """
+    global _pool, _workers
+    workers = workers or os.cpu_count()
+    with _lock:
+        if _pool is not None and _workers != workers:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=_warm_up)
+            _workers = workers
+        return _pool
+
+def shutdown_pool():
+    global _pool, _workers
+    with _lock:
+        pool, _pool, _workers = _pool, None, None
+    if pool is not None: pool.shutdown(wait=False, cancel_futures=True)
+
+def triangulate_many(polys, method, count, calibrate=False, shape_buffer=0.001, workers=None, seed=None, progress=None, cancel=None):
+    """
+    resamples and triangulates every polygon of polys with count points
+    on the shared process pool and returns their TriMeshes in order.
+    progress and cancel work as in triangulate_islands; a pool broken
+    by a dead worker is dropped so the next batch starts a fresh one
+    """
+    if not polys: return []
+    with span("batch triangulation", objects=len(polys)):
+        pool = get_pool(workers)
+        futures = { pool.submit(_triangulate, poly, method, count, calibrate, shape_buffer, seed): i for i, poly in enumerate(polys) }
+        meshes = [ None ] * len(polys)
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                meshes[futures[future]] = future.result()
+                if progress is not None: progress(done, len(polys))
+                if cancel is not None and cancel.is_set():
+                    for f in futures: f.cancel()
+                    raise Cancelled()
+        except BrokenProcessPool:
+            shutdown_pool()
+            raise
+    return meshes
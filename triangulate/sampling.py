@@ -1,80 +1,212 @@
 import numpy as np
 import math
-import random
-from shapely import Point, Polygon
-from random import randrange
-from sklearn.cluster import KMeans
-from scipy.stats import qmc
+import time
+import shapely
 
-def blue_noise_sampling(polygon, count, k=30):
-    xmin, ymin, xmax, ymax = polygon.bounds
+# ----------------------------------------
+# shared containment engine
+# ----------------------------------------
 
-    area = (xmax - xmin) * (ymax - ymin)
-    density = count / polygon.area 
-    radius = np.sqrt(2 / (3 * np.sqrt(3) * density))
+def points_inside(polygon, points):
+    """
+    returns the rows of an (N, 2) array that fall inside polygon,
+    tested in one vectorized call against a prepared geometry
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if not len(points): return points
+    shapely.prepare(polygon)
+    return points[shapely.contains_xy(polygon, points[:, 0], points[:, 1])]
+
+def grid_inside(polygon, x_coords, y_coords):
+    xx, yy = np.meshgrid(x_coords, y_coords, indexing="ij")
+    return points_inside(polygon, np.column_stack([xx.ravel(), yy.ravel()]))
 
+def disc_sampling(polygon, radius, next_candidates, rng, progress=None, clip=True):
+    """
+    grows a set of samples inside polygon that are at least radius apart,
+    over a NumPy background grid. next_candidates(rng, accepted) returns
+    the next batch of candidate points given the ones accepted last
+    round (None on the first), or None to stop; without clip they must
+    all lie inside polygon already. progress(fraction) is called after
+    every round and may raise to stop sampling
+    """
+    xmin, ymin, xmax, ymax = polygon.bounds
+    radius_sq = radius * radius
+    # both samplers size radius for about 0.6 samples per radius squared
+    expected = 0.6 * polygon.area / radius_sq
+
+    # at most one sample per cell, so the grid can hold sample indices;
+    # it is padded by the 2 cells a neighbour lookup reaches out to
     cell_size = radius / np.sqrt(2)
     grid_width = int((xmax - xmin) / cell_size) + 1
     grid_height = int((ymax - ymin) / cell_size) + 1
-    grid = [[-1 for _ in range(grid_height)] for _ in range(grid_width)]
-    samples = []
-    process_list = []
-
-    def grid_coords(point): return int((point[0] - xmin) / cell_size), int((point[1] - ymin) / cell_size)
-    def in_bounds(point): return polygon.contains(Point(point[0], point[1]))
-
-    def fits(point):
-        gx, gy = grid_coords(point)
-        for i in range(max(0, gx-2), min(gx+3, grid_width)):
-            for j in range(max(0, gy-2), min(gy+3, grid_height)):
-                if grid[i][j] != -1:
-                    distance = np.linalg.norm(np.array(point) - np.array(samples[grid[i][j]]))
-                    if distance < radius:
-                        return False
-        return True
-
-    def add_point(point):
-        samples.append(point)
-        process_list.append(point)
-        gx, gy = grid_coords(point)
-        grid[gx][gy] = len(samples) - 1
-
-    first_point = (random.uniform(xmin, xmax), random.uniform(ymin, ymax))
-    while not in_bounds(first_point): first_point = (random.uniform(xmin, xmax), random.uniform(ymin, ymax))
-    add_point(first_point)
-
-    while process_list:
-        point = process_list.pop(random.randint(0, len(process_list) - 1))
-        for _ in range(k):
-            angle = random.uniform(0, 2 * np.pi)
-            r = random.uniform(radius, 2 * radius)
-            new_point = (point[0] + r * np.cos(angle), point[1] + r * np.sin(angle))
-            if in_bounds(new_point) and fits(new_point):
-                add_point(new_point)
-
-    return samples
-
-
-def random_points_sampling(poly, count):
+    # the grid is kept flat, neighbours are fixed offsets into it; the
+    # corners of the 5x5 block are left out, as no point there can be
+    # closer than radius
+    stride = grid_height + 4
+    grid = np.full((grid_width + 4) * stride, -1, dtype=np.int64)
+    offsets = np.array([ i * stride + j for i in range(-2, 3) for j in range(-2, 3) if abs(i) + abs(j) < 4 ])
+    # which candidate claimed each cell this round
+    claims = np.full(len(grid), -1, dtype=np.int64)
+
+    samples = np.zeros((1024, 2))
+    n = 0
+
+    shapely.prepare(polygon)
+
+    def grid_coords(points):
+        g = ((points - (xmin, ymin)) / cell_size).astype(np.int64)
+        return np.minimum(g, (grid_width - 1, grid_height - 1)) + 2
+
+    def add_points(points, cells):
+        nonlocal samples, n
+        while n + len(points) > len(samples): samples = np.vstack([samples, np.zeros_like(samples)])
+        samples[n:n + len(points)] = points
+        grid[cells] = np.arange(n, n + len(points))
+        n = n + len(points)
+
+    accepted = None
+    while True:
+        candidates = next_candidates(rng, accepted)
+        if candidates is None: break
+        candidates = candidates[
+            (candidates[:, 0] >= xmin) & (candidates[:, 0] <= xmax) &
+            (candidates[:, 1] >= ymin) & (candidates[:, 1] <= ymax)
+        ]
+
+        # cheap rejections first: occupied cells, then all but one
+        # candidate per free cell (whichever the candidates, drawn at
+        # random, write last), and only then the polygon test
+        xy = grid_coords(candidates)
+        cells = xy[:, 0] * stride + xy[:, 1]
+        free = grid[cells] < 0
+        candidates, xy, cells = candidates[free], xy[free], cells[free]
+        claims[cells] = np.arange(len(cells))
+        first = claims[cells] == np.arange(len(cells))
+        claims[cells] = -1
+        candidates, xy, cells = candidates[first], xy[first], cells[first]
+        if clip:
+            inside = shapely.contains_xy(polygon, candidates[:, 0], candidates[:, 1])
+            candidates, xy, cells = candidates[inside], xy[inside], cells[inside]
+
+        # cells 3 apart are more than r apart, so candidates of the same
+        # phase, one per cell, never conflict with each other
+        phase = (xy[:, 0] % 3) * 3 + xy[:, 1] % 3
+        accepted = []
+        for p in range(9):
+            c, g = candidates[phase == p], cells[phase == p]
+            neighbours = grid[g[:, None] + offsets]
+            # gathered as complex numbers, one element per point, which
+            # is about twice as fast as gathering (x, y) rows
+            near = samples.view(np.complex128)[neighbours, 0] - (c[:, 0] + 1j * c[:, 1])[:, None]
+            d = near.real ** 2 + near.imag ** 2
+            fits = ((d >= radius_sq) | (neighbours < 0)).all(axis=1)
+
+            add_points(c[fits], g[fits])
+            accepted.append(c[fits])
+        accepted = np.vstack(accepted)
+        if progress is not None: progress(float(min(n / expected, 1.0)))
+
+    return samples[:n].copy()
+
+def target_edge_length(polygon, count):
+    """
+    edge length of an equilateral triangulation with count vertices over
+    the polygon's area, which is what the samplers aim for
+    """
+    if count <= 0: return math.sqrt(polygon.area)
+    return math.sqrt(2 * polygon.area / (math.sqrt(3) * count))
+
+def blue_noise_sampling(polygon, count, k=30, seed=None, progress=None, seeds_every=100):
+    """
+    Bridson's blue noise. The whole active front is expanded at once:
+    k candidates per active sample are generated, clipped to the
+    polygon and distance-checked in batches, from a seed per part and
+    one per seeds_every samples. See disc_sampling for progress
+    """
+    if polygon.is_empty or polygon.area == 0: return np.empty((0, 2))
+
+    # Bridson settles at roughly 0.6 samples per radius squared
+    radius = np.sqrt(0.6 * polygon.area / count)
+    directions = np.exp(2j * np.pi * np.arange(k) / k)
+
+    def next_candidates(rng, active):
+        # a seed per part, as fronts cannot jump between islands, and one
+        # per seeds_every samples, so that fronts meet after a handful of
+        # rounds even along thin strokes instead of crawling their length
+        if active is None:
+            seeds = [ area_weighted_sampling(p, 1, seed=rng) for p in shapely.get_parts(polygon) ]
+            return np.vstack(seeds + [ area_weighted_sampling(polygon, count // seeds_every, seed=rng) ])
+        if not len(active): return None
+        # k evenly spread directions turned by a random angle per sample,
+        # at random distances: as complex numbers, without any cos/sin
+        # per candidate
+        turn = np.exp(1j * rng.uniform(0, 2 * np.pi, (len(active), 1)))
+        r = rng.uniform(radius, 2 * radius, (len(active), k))
+        candidates = (active[:, 0] + 1j * active[:, 1])[:, None] + r * turn * directions
+        return candidates.ravel().view(np.float64).reshape(-1, 2)
+
+    return disc_sampling(polygon, radius, next_candidates, np.random.default_rng(seed), progress)
+
+def random_points_sampling(poly, count, seed=None):
     xmin, ymin, xmax, ymax = poly.bounds
-    bbox = poly.bounds
     w = xmax - xmin
     h = ymax - ymin
     
-    l = xmin
-    t = ymin
-    
-    points = []
-    
-    i = 0
-    ti = 1000000000 # because random wants integers
+    if poly.area == 0: return np.empty((0, 2))
+
+    # draw candidates in batches sized by the fill ratio of the bbox
+    # and keep the ones inside until we have count of them
+    ratio = (w * h) / poly.area
+    points = np.empty((0, 2))
+    rng = np.random.default_rng(seed)
+
+    while len(points) < count:
+        n = int((count - len(points)) * ratio * 1.2) + 16
+        candidates = rng.uniform((xmin, ymin), (xmax, ymax), size=(n, 2))
+        points = np.vstack([points, points_inside(poly, candidates)])
+    return points[:count]
+
+def polygon_triangles(polygon):
+    """
+    returns the triangles covering polygon as a (T, 3, 2) array
+    """
+    if polygon.is_empty or polygon.area == 0: return np.empty((0, 3, 2))
+    triangles = shapely.get_parts(shapely.constrained_delaunay_triangles(polygon))
+    coords = shapely.get_coordinates(shapely.get_exterior_ring(triangles))
+    return coords.reshape(-1, 4, 2)[:, :3]
+
+def triangle_sampler(poly):
+    """
+    returns sample(count, rng), which draws count uniform points from
+    poly; the triangulation and its area weights are computed once here
+    """
+    triangles = polygon_triangles(poly)
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    ab, ac = b - a, c - a
+    areas = 0.5 * np.abs(ab[:, 0] * ac[:, 1] - ab[:, 1] * ac[:, 0])
+    total = areas.sum()
+    cumulative = np.cumsum(areas) / total if total else areas
+
+    def sample(count, rng):
+        if count <= 0 or not total: return np.empty((0, 2))
+        picked = np.minimum(np.searchsorted(cumulative, rng.random(count), side="right"), len(areas) - 1)
+
+        # fold the unit square onto the unit triangle
+        u, v = rng.random((2, count))
+        outside = u + v > 1
+        u[outside], v[outside] = 1 - u[outside], 1 - v[outside]
+        return a[picked] + u[:, None] * ab[picked] + v[:, None] * ac[picked]
 
-    while i < count:
-        p = Point(randrange(math.floor(l * ti), math.ceil(w + l) * ti) / ti, randrange(math.floor(t * ti), math.ceil((h + t) * ti)) / ti)
-        if(poly.contains(p)):
-            points.append(p)
-            i = i + 1
-    return points
+    return sample
+
+def area_weighted_sampling(poly, count, seed=None):
+    """
+    draws exactly count uniform points from polygon by picking
+    triangles weighted by area and sampling them barycentrically,
+    so no candidate is ever rejected
+    """
+    return triangle_sampler(poly)(count, np.random.default_rng(seed))
 
 def uniform_grid_sampling(polygon, num_points):
     area = polygon.area
@@ -84,9 +216,7 @@ def uniform_grid_sampling(polygon, num_points):
     xmin, ymin, xmax, ymax = polygon.bounds
     x_coords = np.arange(xmin, xmax, spacing)
     y_coords = np.arange(ymin, ymax, spacing)
-    envelope = polygon.envelope
-    grid_points = np.array([(x, y) for x in x_coords for y in y_coords if polygon.contains(Point(x, y))])
-    return grid_points.tolist()
+    return grid_inside(polygon, x_coords, y_coords)
 
 
 def hexagonal_grid_sampling(polygon, count):
@@ -98,87 +228,80 @@ def hexagonal_grid_sampling(polygon, count):
     
     width = radius * 2
     height = np.sqrt(3) * radius
-    hex_points = []
-
-    for y in np.arange(ymin, ymax + height, height):
-        for x in np.arange(xmin, xmax + width, width):
-            if polygon.contains(Point(x, y)):
-                hex_points.append((x, y))
-            if polygon.contains(Point(x + radius, y + height / 2)):
-                hex_points.append((x + radius, y + height / 2))
-    
-    return hex_points
 
-def centroid_sampling(poly, count):
+    # two interleaved rectangular lattices make the hexagonal one
+    x_coords = np.arange(xmin, xmax + width, width)
+    y_coords = np.arange(ymin, ymax + height, height)
+    return np.vstack([
+        grid_inside(polygon, x_coords, y_coords),
+        grid_inside(polygon, x_coords + radius, y_coords + height / 2),
+    ])
+
+def centroid_sampling(poly, count, max_iterations=100, tolerance=0.0001, time_budget=2.0, seed=None, progress=None):
+    """
+    centroidal Voronoi sampling by Lloyd iteration over training samples
+    drawn inside the polygon, so every generator stays in the shape and
+    exactly count points come back. progress(fraction) is called after
+    every iteration and may raise to stop sampling
+    """
     # https://github.com/dpasut/python_cvt/blob/master/cvt.py
-    xmin, ymin, xmax, ymax = poly.bounds
-    area = (xmax - xmin) * (ymax - ymin)
-    
-    random_seed = None
-    num_centroids = int(count * area / poly.area)
-    dimensionality = 2
-    num_samples = 10 * num_centroids
-    num_replicates = 1
-    max_iterations = 100
-    tolerance = 0.0001
-    verbose = 0
-    algorithm = "lloyd"
-    X = np.random.rand(num_samples, dimensionality)
-
-    kmeans = KMeans(
-        init="k-means++",
-        algorithm=algorithm,
-        n_clusters=num_centroids,
-        n_init=num_replicates,
-        max_iter=max_iterations,
-        tol=tolerance,
-        verbose=verbose,
-    )
-
-    kmeans.fit(X)
-    centroids = kmeans.cluster_centers_
-    
-    width = xmax - xmin
-    height = ymax - ymin
+    from scipy.spatial import cKDTree
 
-    scale_factor = max(width, height)
-    centroids[:, :2] *= scale_factor
-    centroids[:, 0] += xmin
-    centroids[:, 1] += ymin
-    points = []
+    if count <= 0 or poly.is_empty or poly.area == 0: return np.empty((0, 2))
+    rng = np.random.default_rng(seed)
 
-    for c in centroids.tolist():
-        if poly.contains(Point(c[0], c[1])):
-            points.append(c)
-    return points
+    num_samples = min(10 * count, 1000000)
+    X = area_weighted_sampling(poly, num_samples, seed=rng)
+    centroids = area_weighted_sampling(poly, count, seed=rng)
 
-def poisson_disc_sampling(polygon, num_points):
-    # Get the bounding box from the polygon
-    minx, miny, maxx, maxy = polygon.bounds
+    shapely.prepare(poly)
+    tolerance = tolerance * np.sqrt(poly.area / count)
+    start = time.perf_counter()
 
-    bounds = np.array([[minx, maxx], [miny, maxy]])
+    for iteration in range(max_iterations):
+        _, labels = cKDTree(centroids).query(X)
+        weights = np.bincount(labels, minlength=count)
+        sums = np.column_stack([
+            np.bincount(labels, weights=X[:, 0], minlength=count),
+            np.bincount(labels, weights=X[:, 1], minlength=count),
+        ])
 
-    # Calculate radius for Poisson disc sampling
-    area = polygon.area
-    radius = np.sqrt(area / (num_points * np.pi))
+        # empty cells and cells of concave parts whose mean falls outside
+        # the polygon keep their previous generator
+        moved = centroids.copy()
+        filled = weights > 0
+        moved[filled] = sums[filled] / weights[filled, None]
+        outside = ~shapely.contains_xy(poly, moved[:, 0], moved[:, 1])
+        moved[outside] = centroids[outside]
+
+        shift = np.abs(moved - centroids).max()
+        centroids = moved
+        elapsed = time.perf_counter() - start
+        if shift < tolerance or elapsed > time_budget: break
+        if progress is not None: progress(max((iteration + 1) / max_iterations, elapsed / time_budget))
 
-    # Create Poisson disc sampler
-    sampler = qmc.PoissonDisk(d=2, radius=radius)
+    return centroids
 
-    # Generate points
-    sample = sampler.fill_space()
+def poisson_disc_sampling(polygon, num_points, max_rounds=50, seed=None, progress=None):
+    """
+    Poisson disc sampling by batched dart throwing: darts are only ever
+    drawn inside the polygon, and throwing stops once a round adds
+    almost nothing or after max_rounds. See disc_sampling for progress
+    """
+    if polygon.is_empty or polygon.area == 0: return np.empty((0, 2))
 
-    # Scale the points to fit the bounding box
-    sample = qmc.scale(sample, bounds[:, 0], bounds[:, 1])
+    # dart throwing close to saturation holds about 0.6 samples per
+    # radius squared, sized on the polygon area rather than its bbox
+    radius = np.sqrt(0.6 * polygon.area / num_points)
+    darts = triangle_sampler(polygon)
+    rounds = 0
 
-    # Filter points to keep only those inside the polygon
-    points = [tuple(point) for point in sample if polygon.contains(Point(point))]
+    def next_candidates(rng, accepted):
+        nonlocal rounds
+        rounds = rounds + 1
+        if rounds > max_rounds: return None
+        if accepted is not None and len(accepted) < 0.01 * num_points: return None
+        return darts(2 * num_points, rng)
 
-    # Ensure we have the desired number of points
-    while len(points) < num_points:
-        extra_sample = sampler.fill_space()
-        extra_sample = qmc.scale(extra_sample, bounds[:, 0], bounds[:, 1])
-        points += [tuple(point) for point in extra_sample if polygon.contains(Point(point))]
-        points = points[:num_points]
-        
-    return points
+    # darts come from the polygon's own triangles, none needs clipping
+    return disc_sampling(polygon, radius, next_candidates, np.random.default_rng(seed), progress, clip=False)
@@ -0,0 +1,343 @@
+"""
+in-memory SVG reader: paths and basic shapes, with their transforms
+applied, as cubic Bézier subpaths
+"""
+import math
+import re
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+# Blender's SVG importer maps 90 px to an inch
+PX_TO_M = 0.0254 / 90
+
+# user units per unit, as in Blender's importer
+UNITS = { "": 1.0, "px": 1.0, "in": 90.0, "mm": 90.0 / 25.4, "cm": 90.0 / 2.54, "pt": 1.25, "pc": 15.0, "em": 1.0, "ex": 1.0 }
+
+LENGTH = re.compile(r"\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([a-z]*)")
+NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+PATH_TOKEN = re.compile(r"[MmLlHhVvCcSsQqTtAaZz]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+TRANSFORM = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+
+SKIPPED = { "defs", "clipPath", "mask", "symbol", "marker", "pattern", "style", "title", "desc", "metadata" }
+
+class SVGShape:
+    """
+    one drawable element: its id, its fill-rule and its subpaths, each a
+    ((n, 4, 2) cubic segments array, closed) pair in SVG user units
+    """
+    def __init__(self, id, subpaths, fill_rule="nonzero"):
+        self.id = id
+        self.subpaths = subpaths
+        self.fill_rule = fill_rule
+
+    def loops(self, tolerance):
+        """
+        the subpaths flattened to (k, 2) polylines, open ones implicitly
+        closed as filling does
+        """
+        loops = [ flatten(segments, tolerance, closed) for segments, closed in self.subpaths ]
+        return [ l for l in loops if len(l) >= 3 ]
+
+    def transformed(self, matrix):
+        subpaths = [ (segments @ matrix[:2, :2].T + matrix[:2, 2], closed) for segments, closed in self.subpaths ]
+        return SVGShape(self.id, subpaths, self.fill_rule)
+
+# ----------------------------------------
+# attributes
+# ----------------------------------------
+
+def local_name(tag): return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+def numbers(text): return [ float(n) for n in NUMBER.findall(text or "") ]
+
+def length(text, default=0.0):
+    """
+    a length in px, its unit converted at 90 dpi like Blender's importer
+    """
+    m = LENGTH.match(text or "")
+    if not m: return default
+    return float(m.group(1)) * UNITS.get(m.group(2), 1.0)
+
+def style(element):
+    """
+    presentation attributes overridden by the style attribute
+    """
+    props = dict(element.attrib)
+    for item in (element.get("style") or "").split(";"):
+        if ":" in item:
+            k, v = item.split(":", 1)
+            props[k.strip()] = v.strip()
+    return props
+
+def parse_transform(text):
+    m = np.eye(3)
+    for name, args in TRANSFORM.findall(text or ""):
+        a = numbers(args)
+        t = np.eye(3)
+        if name == "matrix" and len(a) == 6:
+            t[:2] = [ [ a[0], a[2], a[4] ], [ a[1], a[3], a[5] ] ]
+        elif name == "translate" and a:
+            t[:2, 2] = [ a[0], a[1] if len(a) > 1 else 0 ]
+        elif name == "scale" and a:
+            t[0, 0], t[1, 1] = a[0], a[1] if len(a) > 1 else a[0]
+        elif name == "rotate" and a:
+            c, s = math.cos(math.radians(a[0])), math.sin(math.radians(a[0]))
+            t[:2, :2] = [ [ c, -s ], [ s, c ] ]
+            if len(a) == 3:
+                t[:2, 2] = [ a[1] - c * a[1] + s * a[2], a[2] - s * a[1] - c * a[2] ]
+        elif name == "skewX" and a:
+            t[0, 1] = math.tan(math.radians(a[0]))
+        elif name == "skewY" and a:
+            t[1, 0] = math.tan(math.radians(a[0]))
+        m = m @ t
+    return m
+
+# ----------------------------------------
+# path data
+# ----------------------------------------
+
+def line(p0, p1):
+    p0, p1 = np.asarray(p0, dtype=float), np.asarray(p1, dtype=float)
+    return np.array([ p0, p0 + (p1 - p0) / 3, p0 + 2 * (p1 - p0) / 3, p1 ])
+
+def quadratic(p0, c, p1):
+    p0, c, p1 = (np.asarray(p, dtype=float) for p in (p0, c, p1))
+    return np.array([ p0, p0 + 2 * (c - p0) / 3, p1 + 2 * (c - p1) / 3, p1 ])
+
+def arc(p0, rx, ry, phi, large, sweep, p1):
+    """
+    endpoint arc as cubic segments of at most 90 degrees each
+    (SVG 1.1 implementation notes, F.6.5)
+    """
+    p0, p1 = np.asarray(p0, dtype=float), np.asarray(p1, dtype=float)
+    rx, ry = abs(rx), abs(ry)
+    if rx == 0 or ry == 0 or np.allclose(p0, p1): return [ line(p0, p1) ]
+
+    c, s = math.cos(math.radians(phi)), math.sin(math.radians(phi))
+    rot = np.array([ [ c, -s ], [ s, c ] ])
+    x1, y1 = rot.T @ ((p0 - p1) / 2)
+
+    scale = (x1 / rx) ** 2 + (y1 / ry) ** 2
+    if scale > 1: rx, ry = rx * math.sqrt(scale), ry * math.sqrt(scale)
+
+    num = rx * rx * ry * ry - rx * rx * y1 * y1 - ry * ry * x1 * x1
+    den = rx * rx * y1 * y1 + ry * ry * x1 * x1
+    k = math.sqrt(max(0.0, num / den))
+    if large == sweep: k = -k
+    cx, cy = k * rx * y1 / ry, -k * ry * x1 / rx
+    center = rot @ (cx, cy) + (p0 + p1) / 2
+
+    def angle(u, v): return math.atan2(u[0] * v[1] - u[1] * v[0], u[0] * v[0] + u[1] * v[1])
+    start = angle((1, 0), ((x1 - cx) / rx, (y1 - cy) / ry))
+    delta = angle(((x1 - cx) / rx, (y1 - cy) / ry), ((-x1 - cx) / rx, (-y1 - cy) / ry))
+    if not sweep and delta > 0: delta -= 2 * math.pi
+    if sweep and delta < 0: delta += 2 * math.pi
+
+    pieces = max(1, math.ceil(abs(delta) / (math.pi / 2) - 1e-9))
+    d = delta / pieces
+    h = 4 / 3 * math.tan(d / 4)
+    segments = []
+    for i in range(pieces):
+        a0, a1 = start + i * d, start + (i + 1) * d
+        e0 = np.array([ math.cos(a0), math.sin(a0) ])
+        e1 = np.array([ math.cos(a1), math.sin(a1) ])
+        q = np.array([ e0, e0 + h * np.array([ -e0[1], e0[0] ]), e1 - h * np.array([ -e1[1], e1[0] ]), e1 ])
+        segments.append((q * (rx, ry)) @ rot.T + center)
+    segments[0][0], segments[-1][3] = p0, p1
+    return segments
+
+def parse_path(d):
+    """
+    returns the subpaths of path data d as ((n, 4, 2) array, closed) pairs
+    """
+    tokens = PATH_TOKEN.findall(d or "")
+    subpaths = []
+    segments = []
+    current = np.zeros(2)
+    start = np.zeros(2)
+    last_control = None
+    last_command = None
+    command = None
+    i = 0
+
+    def finish(closed):
+        nonlocal segments
+        if closed and not np.allclose(current, start): segments.append(line(current, start))
+        if segments: subpaths.append((np.array(segments), closed))
+        segments = []
+
+    def take(n):
+        nonlocal i
+        values = [ float(t) for t in tokens[i:i + n] ]
+        i += n
+        return values
+
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            command = tokens[i]
+            i += 1
+        elif command is None:
+            break
+        relative = command.islower()
+        c = command.upper()
+        offset = current if relative else np.zeros(2)
+
+        if c == "Z":
+            finish(True)
+            current = start.copy()
+            last_control = None
+            # a command letter has to follow
+            command = None
+            continue
+
+        if c == "A":
+            # arc flags are single digits and need no separator, as in
+            # the "a10 10 0 1020 0" optimizers write: split them off
+            for k in (i + 3, i + 4):
+                if k < len(tokens) and len(tokens[k]) > 1 and tokens[k][0] in "01":
+                    tokens[k:k + 1] = [ tokens[k][0], tokens[k][1:] ]
+        arity = { "M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2, "A": 7 }[c]
+        if i + arity > len(tokens) or any(t.isalpha() for t in tokens[i:i + arity]): break
+        a = take(arity)
+        control = None
+
+        if c == "M":
+            finish(False)
+            current = start = offset + a
+            # further coordinate pairs are implicit linetos
+            command = "l" if relative else "L"
+        elif c in "LHV":
+            if c == "H": p = np.array([ a[0] + (current[0] if relative else 0), current[1] ])
+            elif c == "V": p = np.array([ current[0], a[0] + (current[1] if relative else 0) ])
+            else: p = offset + a
+            segments.append(line(current, p))
+            current = p
+        elif c in "CS":
+            if c == "C": c1, c2, p = offset + a[0:2], offset + a[2:4], offset + a[4:6]
+            else:
+                c1 = 2 * current - last_control if last_control is not None and last_command in "CS" else current
+                c2, p = offset + a[0:2], offset + a[2:4]
+            segments.append(np.array([ current, c1, c2, p ]))
+            control, current = c2, p
+        elif c in "QT":
+            if c == "Q": q, p = offset + a[0:2], offset + a[2:4]
+            else:
+                q = 2 * current - last_control if last_control is not None and last_command in "QT" else current
+                p = offset + a[0:2]
+            segments.append(quadratic(current, q, p))
+            control, current = q, p
+        elif c == "A":
+            p = offset + a[5:7]
+            segments.extend(arc(current, a[0], a[1], a[2], bool(a[3]), bool(a[4]), p))
+            current = p
+
+        last_control = control
+        last_command = c
+
+    finish(False)
+    return subpaths
+
+def flatten(segments, tolerance, closed=True):
+    """
+    flattens (n, 4, 2) cubic segments into a polyline whose chordal
+    error stays under tolerance: each segment gets the number of
+    uniform pieces Wang's bound asks for, so straight segments stay a
+    single edge and tight curves get dense
+    """
+    second = np.maximum(
+        np.linalg.norm(segments[:, 0] - 2 * segments[:, 1] + segments[:, 2], axis=1),
+        np.linalg.norm(segments[:, 1] - 2 * segments[:, 2] + segments[:, 3], axis=1),
+    )
+    pieces = np.maximum(1, np.ceil(np.sqrt(0.75 * second / tolerance))).astype(np.int64)
+
+    owner = np.repeat(np.arange(len(segments)), pieces)
+    t = (np.arange(len(owner)) - np.repeat(np.cumsum(pieces) - pieces, pieces)) / pieces[owner]
+    t = t[:, None]
+    p = segments[owner]
+    points = (1 - t) ** 3 * p[:, 0] + 3 * (1 - t) ** 2 * t * p[:, 1] + 3 * (1 - t) * t ** 2 * p[:, 2] + t ** 3 * p[:, 3]
+    if not closed: points = np.vstack([ points, segments[-1:, 3] ])
+    return points
+
+# ----------------------------------------
+# basic shapes, as path data
+# ----------------------------------------
+
+def rect_path(e):
+    x, y, w, h = (length(e.get(k)) for k in ("x", "y", "width", "height"))
+    if w <= 0 or h <= 0: return ""
+    rx, ry = e.get("rx"), e.get("ry")
+    rx, ry = length(rx if rx is not None else ry), length(ry if ry is not None else rx)
+    rx, ry = min(rx, w / 2), min(ry, h / 2)
+    if not rx or not ry:
+        return "M{} {}H{}V{}H{}Z".format(x, y, x + w, y + h, x)
+    return ("M{x1} {y}H{x2}A{rx} {ry} 0 0 1 {r} {y1}V{y2}A{rx} {ry} 0 0 1 {x2} {b}"
+            "H{x1}A{rx} {ry} 0 0 1 {x} {y2}V{y1}A{rx} {ry} 0 0 1 {x1} {y}Z").format(
+        x=x, y=y, r=x + w, b=y + h, rx=rx, ry=ry, x1=x + rx, x2=x + w - rx, y1=y + ry, y2=y + h - ry)
+
+def ellipse_path(cx, cy, rx, ry):
+    if rx <= 0 or ry <= 0: return ""
+    return "M{} {}A{} {} 0 0 1 {} {}A{} {} 0 0 1 {} {}Z".format(cx + rx, cy, rx, ry, cx - rx, cy, rx, ry, cx + rx, cy)
+
+def element_path(e, tag):
+    if tag == "path": return e.get("d")
+    if tag == "rect": return rect_path(e)
+    if tag == "circle":
+        r = length(e.get("r"))
+        return ellipse_path(length(e.get("cx")), length(e.get("cy")), r, r)
+    if tag == "ellipse":
+        return ellipse_path(length(e.get("cx")), length(e.get("cy")), length(e.get("rx")), length(e.get("ry")))
+    if tag == "line":
+        return "M{} {}L{} {}".format(*(length(e.get(k)) for k in ("x1", "y1", "x2", "y2")))
+    if tag in ("polyline", "polygon"):
+        p = numbers(e.get("points"))
+        if len(p) < 4: return ""
+        d = "M" + " ".join(str(v) for v in p[:len(p) // 2 * 2])
+        return d + "Z" if tag == "polygon" else d
+    return None
+
+# ----------------------------------------
+# document
+# ----------------------------------------
+
+def parse_svg(data):
+    """
+    parses SVG bytes (or text) and returns a list of SVGShape, in
+    document order, with every transform applied
+    """
+    root = ET.fromstring(data)
+    shapes = []
+
+    def walk(element, matrix, inherited):
+        tag = local_name(element.tag)
+        if tag in SKIPPED: return
+        props = style(element)
+        if props.get("display") == "none": return
+        fill_rule = props.get("fill-rule", inherited)
+        matrix = matrix @ parse_transform(element.get("transform"))
+
+        d = element_path(element, tag)
+        if d:
+            subpaths = parse_path(d)
+            if subpaths:
+                shapes.append(SVGShape(element.get("id") or tag, subpaths, fill_rule).transformed(matrix))
+
+        for child in element: walk(child, matrix, fill_rule)
+
+    walk(root, viewbox_matrix(root), "nonzero")
+    return shapes
+
+def viewbox_matrix(root):
+    """
+    maps the viewBox onto the width and height of the document, if
+    both are given, keeping the aspect ratio
+    """
+    box = numbers(root.get("viewBox"))
+    width, height = root.get("width"), root.get("height")
+    m = np.eye(3)
+    if len(box) != 4 or not width or not height or box[2] <= 0 or box[3] <= 0: return m
+    if "%" in width or "%" in height: return m
+    s = min(length(width) / box[2], length(height) / box[3])
+    m[0, 0] = m[1, 1] = s
+    m[:2, 2] = [ -box[0] * s, -box[1] * s ]
+    return m
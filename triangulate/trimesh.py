@@ -0,0 +1,114 @@
+import numpy as np
+
+class TriMesh:
+    """
+    compact mesh passed between the pipeline stages: a float32 (N, 3)
+    vertex array, and faces as one flat int32 index array split by
+    int32 offsets (F + 1 of them), so ngons fit next to triangles
+    """
+    def __init__(self, vertices, indices, offsets):
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3)
+        self.indices = np.ascontiguousarray(indices, dtype=np.int32).ravel()
+        self.offsets = np.ascontiguousarray(offsets, dtype=np.int32).ravel()
+
+    @classmethod
+    def from_triangles(cls, vertices, triangles):
+        vertices = np.asarray(vertices).reshape(len(vertices), -1)
+        if vertices.shape[1] == 2: vertices = np.column_stack([ vertices, np.zeros(len(vertices)) ])
+        return cls(vertices, triangles, np.arange(0, 3 * len(triangles) + 1, 3))
+
+    @classmethod
+    def from_polygons(cls, polygons):
+        """
+        builds a mesh out of a list of (k, 2) or (k, 3) coordinate
+        arrays, merging vertices with equal coordinates
+        """
+        polygons = [ np.asarray(p, dtype=float)[:, :2] for p in polygons ]
+        sizes = np.array([ len(p) for p in polygons ], dtype=np.int64)
+        if not len(polygons): return cls(np.empty((0, 3)), [], [0])
+
+        vertices, indices = np.unique(np.vstack(polygons), axis=0, return_inverse=True)
+        return cls(np.column_stack([ vertices, np.zeros(len(vertices)) ]), indices.ravel(), np.concatenate([[0], np.cumsum(sizes)]))
+
+    @classmethod
+    def concatenate(cls, meshes):
+        meshes = list(meshes)
+        if not meshes: return cls(np.empty((0, 3)), [], [0])
+        base = np.cumsum([0] + [ len(m.vertices) for m in meshes[:-1] ])
+        loops = np.cumsum([0] + [ len(m.indices) for m in meshes[:-1] ])
+        return cls(
+            np.vstack([ m.vertices for m in meshes ]),
+            np.concatenate([ m.indices + b for m, b in zip(meshes, base) ]),
+            np.concatenate([[0]] + [ m.offsets[1:] + l for m, l in zip(meshes, loops) ]),
+        )
+
+    @property
+    def loop_starts(self): return self.offsets[:-1]
+
+    @property
+    def loop_totals(self): return np.diff(self.offsets)
+
+    def __len__(self): return len(self.offsets) - 1
+
+    def triangle_quality(self):
+        """
+        radius ratio (2 * inradius / circumradius) of every face of a
+        triangle-only mesh: 1 for equilateral, 0 for degenerate triangles
+        """
+        t = self.vertices[self.indices.reshape(-1, 3)].astype(float)
+        a = np.linalg.norm(t[:, 1] - t[:, 2], axis=1)
+        b = np.linalg.norm(t[:, 2] - t[:, 0], axis=1)
+        c = np.linalg.norm(t[:, 0] - t[:, 1], axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            q = (b + c - a) * (c + a - b) * (a + b - c) / (a * b * c)
+        return np.nan_to_num(q)
+
+    def edges(self):
+        """
+        returns the unique undirected edges as an (E, 2) array and the
+        number of faces using each
+        """
+        nxt = np.arange(1, len(self.indices) + 1)
+        nxt[self.offsets[1:] - 1] = self.offsets[:-1]
+        edges = np.sort(np.column_stack([ self.indices, self.indices[nxt] ]), axis=1)
+        return np.unique(edges, axis=0, return_counts=True)
+
+    def mean_interior_edge_length(self):
+        edges, counts = self.edges()
+        edges = edges[counts > 1]
+        if not len(edges): return 0.0
+        return float(np.linalg.norm(self.vertices[edges[:, 0]] - self.vertices[edges[:, 1]], axis=1).mean())
+
+def boundary_loops(edges, coords):
+    """
+    orders boundary edges, given as an (E, 2) vertex index array, into
+    loops in one walk over a vertex -> edge adjacency and returns the
+    coordinates of each loop as a (k, 2) array
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    coords = np.asarray(coords)
+    if not len(edges): return []
+
+    # vertex -> edge adjacency in CSR form
+    ends = edges.ravel()
+    order = np.argsort(ends, kind="stable")
+    offsets = np.searchsorted(ends[order], np.arange(len(coords) + 1)).tolist()
+    adjacent = (order // 2).tolist()
+    edge_list = edges.tolist()
+
+    visited = [ False ] * len(edge_list)
+    loops = []
+    for e in range(len(edge_list)):
+        if visited[e]: continue
+        visited[e] = True
+        start, v = edge_list[e]
+        loop = [ start ]
+        while v != start:
+            loop.append(v)
+            e = next((a for a in adjacent[offsets[v]:offsets[v + 1]] if not visited[a]), None)
+            if e is None: break # open chain
+            visited[e] = True
+            a, b = edge_list[e]
+            v = b if a == v else a
+        loops.append(coords[loop, :2])
+    return loops